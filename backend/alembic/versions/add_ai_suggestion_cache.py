@@ -0,0 +1,37 @@
+"""Add recipe cache columns to ai_suggestions table
+
+Revision ID: add_ai_suggestion_cache
+Revises: add_mailbox_fields
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ai_suggestion_cache'
+down_revision = 'add_mailbox_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated recipes are cached in ai_suggestions, keyed by a hash of the inputs
+    op.add_column('ai_suggestions', sa.Column('cache_key', sa.String(64), nullable=True))
+    op.add_column('ai_suggestions', sa.Column('language', sa.String(10), nullable=True))
+    op.add_column('ai_suggestions', sa.Column('ingredients', sa.Text(), nullable=True))
+    op.add_column('ai_suggestions', sa.Column('model', sa.String(100), nullable=True))
+    op.add_column('ai_suggestions', sa.Column('hit_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('ai_suggestions', sa.Column('last_used_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_ai_suggestions_cache_key', 'ai_suggestions', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_suggestions_cache_key', table_name='ai_suggestions')
+    op.drop_column('ai_suggestions', 'last_used_at')
+    op.drop_column('ai_suggestions', 'hit_count')
+    op.drop_column('ai_suggestions', 'model')
+    op.drop_column('ai_suggestions', 'ingredients')
+    op.drop_column('ai_suggestions', 'language')
+    op.drop_column('ai_suggestions', 'cache_key')
@@ -0,0 +1,31 @@
+"""Add news updated_at column and listing indexes
+
+Revision ID: add_news_listing_indexes
+Revises: add_email_outbox
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_news_listing_indexes'
+down_revision = 'add_email_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # updated_at drives the ETag/Last-Modified of the news listing
+    op.add_column('news', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE news SET published_at = COALESCE(published_at, created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE news SET updated_at = COALESCE(created_at, published_at)")
+    op.create_index('ix_news_language_published_id', 'news', ['language', 'published_at', 'id'], unique=False)
+    op.create_index('ix_news_language_updated', 'news', ['language', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_language_updated', table_name='news')
+    op.drop_index('ix_news_language_published_id', table_name='news')
+    op.drop_column('news', 'updated_at')
@@ -0,0 +1,61 @@
+"""Add recipe_ingredient_tokens for index-backed ingredient word lookups
+
+Revision ID: add_recipe_ingredient_tokens
+Revises: add_rendered_content
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_recipe_ingredient_tokens'
+down_revision = 'add_rendered_content'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per word of recipe_ingredients.normalized_key, so the ingredient
+    # filter can match words by equality instead of '% word %' LIKE scans
+    tokens = op.create_table(
+        'recipe_ingredient_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ingredient_id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(100), nullable=False),
+        sa.ForeignKeyConstraint(['ingredient_id'], ['recipe_ingredients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_recipe_ingredient_tokens_id', 'recipe_ingredient_tokens', ['id'], unique=False)
+    op.create_index('ix_recipe_ingredient_tokens_ingredient_id', 'recipe_ingredient_tokens', ['ingredient_id'], unique=False)
+    op.create_index('ix_recipe_ingredient_tokens_token_ingredient', 'recipe_ingredient_tokens', ['token', 'ingredient_id'], unique=False)
+
+    # Split the keys of existing ingredient rows, in id batches
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, normalized_key FROM recipe_ingredients "
+                "WHERE id > :last_id ORDER BY id LIMIT 1000"
+            ),
+            {"last_id": last_id},
+        ).fetchall()
+        if not rows:
+            break
+        mappings = [
+            {"ingredient_id": ingredient_id, "token": token}
+            for ingredient_id, key in rows
+            for token in sorted({word[:100] for word in (key or "").split()})
+        ]
+        if mappings:
+            op.bulk_insert(tokens, mappings)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_ingredient_tokens_token_ingredient', table_name='recipe_ingredient_tokens')
+    op.drop_index('ix_recipe_ingredient_tokens_ingredient_id', table_name='recipe_ingredient_tokens')
+    op.drop_index('ix_recipe_ingredient_tokens_id', table_name='recipe_ingredient_tokens')
+    op.drop_table('recipe_ingredient_tokens')
@@ -0,0 +1,44 @@
+"""Add normalized recipe_ingredients table
+
+Revision ID: add_recipe_ingredients
+Revises: add_ai_suggestion_cache
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_recipe_ingredients'
+down_revision = 'add_ai_suggestion_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per ingredient line of recipes.ingredients (JSON text), so recipes
+    # can be filtered by ingredient in SQL. Existing recipes are filled by
+    # scripts/backfill_recipe_ingredients.py.
+    op.create_table(
+        'recipe_ingredients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipe_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('name', sa.String(300), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=True),
+        sa.Column('unit', sa.String(50), nullable=True),
+        sa.Column('normalized_key', sa.String(300), nullable=False),
+        sa.ForeignKeyConstraint(['recipe_id'], ['recipes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_recipe_ingredients_id', 'recipe_ingredients', ['id'], unique=False)
+    op.create_index('ix_recipe_ingredients_recipe_id', 'recipe_ingredients', ['recipe_id'], unique=False)
+    op.create_index('ix_recipe_ingredients_key_recipe', 'recipe_ingredients', ['normalized_key', 'recipe_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipe_ingredients_key_recipe', table_name='recipe_ingredients')
+    op.drop_index('ix_recipe_ingredients_recipe_id', table_name='recipe_ingredients')
+    op.drop_index('ix_recipe_ingredients_id', table_name='recipe_ingredients')
+    op.drop_table('recipe_ingredients')
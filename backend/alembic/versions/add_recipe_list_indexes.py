@@ -0,0 +1,32 @@
+"""Add composite indexes for paginated recipe listing
+
+Revision ID: add_recipe_list_indexes
+Revises: add_recipe_ingredients
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_recipe_list_indexes'
+down_revision = 'add_recipe_ingredients'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset cursors compare (created_at, id); rows without a timestamp would
+    # never be reached, so give them one.
+    op.execute("UPDATE recipes SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.create_index('ix_recipes_language_created_id', 'recipes', ['language', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_recipes_language_healthy_created_id', 'recipes',
+        ['language', 'is_healthy', 'created_at', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipes_language_healthy_created_id', table_name='recipes')
+    op.drop_index('ix_recipes_language_created_id', table_name='recipes')
@@ -0,0 +1,29 @@
+"""Add pre-rendered HTML and content hash to pages and news
+
+Revision ID: add_rendered_content
+Revises: add_news_listing_indexes
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_rendered_content'
+down_revision = 'add_news_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled on write; existing rows: python scripts/backfill_rendered_content.py
+    for table in ('pages', 'news'):
+        op.add_column(table, sa.Column('content_html', sa.Text(), nullable=True))
+        op.add_column(table, sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('news', 'pages'):
+        op.drop_column(table, 'content_hash')
+        op.drop_column(table, 'content_html')
@@ -1,13 +1,23 @@
 """Central authentication module for shared auth utilities."""
 from fastapi import Depends, HTTPException, status, Header
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import math
 import os
-from typing import Optional
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
-from .database import get_db
+from .cache import TTLCache
+from .database import get_async_db, get_db
 from .models import User
 
 # JWT Configuration
@@ -15,9 +25,28 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified-token cache: avoids re-decoding the JWT and re-querying the user
+# on every authenticated request. Entries never outlive the token's `exp`.
+# The cache is per process: invalidate_cached_user() only reaches the worker
+# that made the change, so other workers may serve a user snapshot up to the
+# TTL old. Keep the TTL short (or 0 to disable) when running several workers.
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "1024"))
+
+# Secrets are never kept in the cache
+_SNAPSHOT_EXCLUDED_FIELDS = {"hashed_password", "email_verification_token", "mailbox_password_hash"}
+
+token_cache = TTLCache(max_entries=TOKEN_CACHE_MAX_ENTRIES, default_ttl=TOKEN_CACHE_TTL_SECONDS)
+
 # Password hashing
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+# Argon2 is CPU-heavy; async routes run it on a small dedicated pool so a
+# login burst neither blocks the event loop nor starves the shared threadpool.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Hash/verify calls queued or running before new ones are rejected with 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
 
 def hash_password(password: str) -> str:
     """Hash a password using Argon2."""
@@ -29,6 +58,107 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHasherPool:
+    """Bounded executor for Argon2 work with queue-wait and run-time metrics"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        # operation -> recent (queue wait, run time) samples in seconds
+        self._samples: Dict[str, deque] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+        return self._executor
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) on the pool and await its result.
+
+        Raises:
+            HTTPException: 503 if max_pending calls are already queued/running
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        queued_at = time.perf_counter()
+        timings = {}
+
+        def timed():
+            started = time.perf_counter()
+            timings["wait"] = started - queued_at
+            try:
+                return fn(*args)
+            finally:
+                timings["run"] = time.perf_counter() - started
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                if "run" in timings:
+                    samples = self._samples.setdefault(operation, deque(maxlen=500))
+                    samples.append((timings["wait"], timings["run"]))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and latency percentiles (ms) for the metrics endpoint"""
+        def summary(values):
+            ordered = sorted(values)
+            return {
+                "avg": round(sum(ordered) / len(ordered) * 1000, 3),
+                "p95": round(ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)] * 1000, 3),
+                "max": round(ordered[-1] * 1000, 3),
+            }
+
+        with self._lock:
+            operations = {
+                operation: {
+                    "samples": len(samples),
+                    "queue_wait_ms": summary([wait for wait, _ in samples]),
+                    "run_ms": summary([run for _, run in samples]),
+                }
+                for operation, samples in self._samples.items() if samples
+            }
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "rejected": self.rejected,
+                "operations": operations,
+            }
+
+
+password_hasher = PasswordHasherPool()
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bounded Argon2 pool (for async routes)."""
+    return await password_hasher.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded Argon2 pool (for async routes)."""
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -41,20 +171,39 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
-def get_current_user_from_token(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> User:
+def _token_key(token: str) -> str:
+    """Cache key for a raw bearer token (the token itself is never stored)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _snapshot_user(user: User) -> dict:
+    """Copy the non-secret column values of a user"""
+    return {
+        column.name: getattr(user, column.name)
+        for column in User.__table__.columns
+        if column.name not in _SNAPSHOT_EXCLUDED_FIELDS
+    }
+
+
+def invalidate_cached_user(user_id: Optional[int] = None, username: Optional[str] = None) -> int:
     """
-    Extract and validate user from JWT token in Authorization header.
-    
-    Args:
-        authorization: Authorization header value (e.g., "Bearer <token>")
-        db: Database session
-        
+    Drop cached tokens for a user whose permissions or existence changed.
+
+    Call it after committing any change to a snapshotted User column
+    (verification, admin flag, mailbox state, ...). Only this process's
+    cache is affected.
+
     Returns:
-        User object from database
-        
-    Raises:
-        HTTPException: If token is invalid or user not found
+        Number of cache entries removed
     """
+    return token_cache.discard_where(
+        lambda _, snapshot: (user_id is not None and snapshot["id"] == user_id)
+        or (username is not None and snapshot["username"] == username)
+    )
+
+
+def _bearer_token(authorization: Optional[str]) -> str:
+    """Extract the token from an "Authorization: Bearer <token>" header"""
     if not authorization:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,9 +217,11 @@ def get_current_user_from_token(authorization: Optional[str] = Header(None), db:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication header"
         )
-    
-    token = parts[1]
-    
+    return parts[1]
+
+
+def _decode_token(token: str) -> dict:
+    """Verify a JWT and return its payload (which must name a user in `sub`)"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -84,12 +235,82 @@ def get_current_user_from_token(authorization: Optional[str] = Header(None), db:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
+    return payload
+
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="User not found"
+    )
+
+
+def get_current_user_from_token(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> User:
+    """
+    Extract and validate user from JWT token in Authorization header.
     
-    db_user = db.query(User).filter(User.username == username).first()
+    Args:
+        authorization: Authorization header value (e.g., "Bearer <token>")
+        db: Database session
+        
+    Returns:
+        User object from database, or a detached copy of it when the token
+        was already verified recently (see ``token_cache``)
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token = _bearer_token(authorization)
+    cache_key = _token_key(token)
+
+    snapshot = token_cache.get(cache_key)
+    if snapshot is not None:
+        # Detached instance built from the snapshot; routes that need to
+        # modify the user re-query it through their own session.
+        return User(**snapshot)
+    
+    payload = _decode_token(token)
+    db_user = db.query(User).filter(User.username == payload["sub"]).first()
     if db_user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+        raise _user_not_found()
+
+    token_cache.set(cache_key, _snapshot_user(db_user), expires_at=payload.get("exp"))
     
     return db_user
+
+
+async def get_current_user_async(
+    authorization: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Async variant of get_current_user_from_token for routes using get_async_db.
+
+    Shares the verified-token cache with the sync dependency.
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token = _bearer_token(authorization)
+    cache_key = _token_key(token)
+
+    snapshot = token_cache.get(cache_key)
+    if snapshot is not None:
+        return User(**snapshot)
+
+    payload = _decode_token(token)
+    result = await db.execute(select(User).where(User.username == payload["sub"]))
+    db_user = result.scalars().first()
+    if db_user is None:
+        raise _user_not_found()
+
+    token_cache.set(cache_key, _snapshot_user(db_user), expires_at=payload.get("exp"))
+
+    return db_user
+
+
+def get_optional_user_from_token(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)) -> Optional[User]:
+    """Like get_current_user_from_token, but returns None for anonymous requests"""
+    if not authorization:
+        return None
+    return get_current_user_from_token(authorization=authorization, db=db)
@@ -1,19 +1,23 @@
 """
 Email configuration for Reste-Rampe with Mailcow integration
 """
+import logging
 import os
 from typing import Optional
 
-# Mailcow SMTP Configuration
-MAILCOW_SMTP_HOST = os.getenv("MAILCOW_SMTP_HOST", "mailcowdockerized-postfix-mailcow-1")
+logger = logging.getLogger(__name__)
+
+# Mailcow SMTP Configuration (shared by all mail senders, see app.mail_transport)
+MAILCOW_SMTP_HOST = os.getenv("MAILCOW_SMTP_HOST", "mailcow-postfix")
 MAILCOW_SMTP_PORT = int(os.getenv("MAILCOW_SMTP_PORT", "587"))  # SMTP with TLS
 MAILCOW_SMTP_USER = os.getenv("MAILCOW_SMTP_USER", "noreply@reste-rampe.tech")
-MAILCOW_SMTP_PASSWORD = os.getenv("MAILCOW_SMTP_PASSWORD", "noreply")
+MAILCOW_SMTP_PASSWORD = os.getenv("MAILCOW_SMTP_PASSWORD", "")
 MAILCOW_SMTP_TLS = os.getenv("MAILCOW_SMTP_TLS", "true").lower() == "true"
 
 # Email Configuration
 FROM_EMAIL = os.getenv("FROM_EMAIL", "noreply@reste-rampe.tech")
 FROM_NAME = os.getenv("FROM_NAME", "Reste-Rampe")
+FRONTEND_URL = os.getenv("FRONTEND_URL", "https://reste-rampe.tech")
 
 class EmailConfig:
     """Email configuration for SMTP"""
@@ -24,6 +28,7 @@ class EmailConfig:
     SMTP_TLS = MAILCOW_SMTP_TLS
     FROM_EMAIL = FROM_EMAIL
     FROM_NAME = FROM_NAME
+    FRONTEND_URL = FRONTEND_URL
 
 async def send_email(
     to_email: str,
@@ -32,7 +37,7 @@ async def send_email(
     html_body: Optional[str] = None
 ) -> bool:
     """
-    Send email via Mailcow SMTP
+    Send email via Mailcow SMTP (pooled connection, off the event loop)
     
     Args:
         to_email: Recipient email address
@@ -43,93 +48,29 @@ async def send_email(
     Returns:
         True if email sent successfully, False otherwise
     """
+    from .mail_transport import build_message, mail_transport
+
     try:
-        import smtplib
-        import uuid
-        from datetime import datetime
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-        
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{EmailConfig.FROM_NAME} <{EmailConfig.FROM_EMAIL}>"
-        msg["To"] = to_email
-        msg["Message-ID"] = f"<{uuid.uuid4()}@reste-rampe.tech>"
-        msg["Date"] = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000")
-        
-        # Add plain text part
-        msg.attach(MIMEText(body, "plain"))
-        
-        # Add HTML part if provided
-        if html_body:
-            msg.attach(MIMEText(html_body, "html"))
-        
-        # Send email
-        with smtplib.SMTP(EmailConfig.SMTP_HOST, EmailConfig.SMTP_PORT) as server:
-            if EmailConfig.SMTP_TLS:
-                server.starttls()
-            server.login(EmailConfig.SMTP_USER, EmailConfig.SMTP_PASSWORD)
-            server.sendmail(EmailConfig.FROM_EMAIL, to_email, msg.as_string())
-        
+        await mail_transport.send_async(build_message(to_email, subject, body, html_body))
         return True
     except Exception as e:
-        print(f"Error sending email: {e}")
+        logger.error(f"Error sending email to {to_email}: {e}")
         return False
 
 # Email templates
 class EmailTemplates:
-    """Email templates for common tasks"""
+    """Email templates for common tasks (rendered from app/email_templates)"""
     
     @staticmethod
-    def welcome_email(username: str, email: str) -> tuple[str, str]:
+    def welcome_email(username: str, email: str, language: str = "de") -> tuple[str, str, str]:
         """Welcome email for new users"""
-        subject = "Willkommen bei Reste-Rampe!"
-        body = f"""Hallo {username},
-
-willkommen bei Reste-Rampe! Dein Konto wurde erfolgreich erstellt.
+        from .email_templates import render_email
 
-Du kannst dich jetzt unter https://reste-rampe.tech anmelden.
-
-Viel Erfolg!
-Das Reste-Rampe Team"""
-        
-        html_body = f"""<html>
-<body style="font-family: Arial, sans-serif;">
-<h2>Willkommen bei Reste-Rampe!</h2>
-<p>Hallo {username},</p>
-<p>willkommen bei Reste-Rampe! Dein Konto wurde erfolgreich erstellt.</p>
-<p><a href="https://reste-rampe.tech" style="background-color: #00CED1; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Jetzt anmelden</a></p>
-<p>Das Reste-Rampe Team</p>
-</body>
-</html>"""
-        
-        return subject, body, html_body
+        return render_email("welcome", language, username=username, login_url=FRONTEND_URL)
     
     @staticmethod
-    def password_reset_email(username: str, reset_link: str) -> tuple[str, str]:
+    def password_reset_email(username: str, reset_link: str, language: str = "de") -> tuple[str, str, str]:
         """Password reset email"""
-        subject = "Passwort zurücksetzen - Reste-Rampe"
-        body = f"""Hallo {username},
-
-du hast eine Anfrage zum Zurücksetzen deines Passworts gestellt.
+        from .email_templates import render_email
 
-Klicke auf den folgenden Link, um dein Passwort zu ändern:
-{reset_link}
-
-Dieser Link ist 24 Stunden gültig.
-
-Das Reste-Rampe Team"""
-        
-        html_body = f"""<html>
-<body style="font-family: Arial, sans-serif;">
-<h2>Passwort zurücksetzen</h2>
-<p>Hallo {username},</p>
-<p>du hast eine Anfrage zum Zurücksetzen deines Passworts gestellt.</p>
-<p><a href="{reset_link}" style="background-color: #00CED1; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Passwort zurücksetzen</a></p>
-<p><em>Dieser Link ist 24 Stunden gültig.</em></p>
-<p>Das Reste-Rampe Team</p>
-</body>
-</html>"""
-        
-        return subject, body, html_body
+        return render_email("password_reset", language, username=username, reset_link=reset_link)
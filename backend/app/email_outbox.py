@@ -0,0 +1,252 @@
+"""
+Email Outbox Sender
+
+Request handlers only insert EmailOutbox rows; this background sender
+delivers them. Due rows are claimed in batches with FOR UPDATE SKIP LOCKED
+(so several workers can run a sender without sending twice) and leased by
+setting them to "sending" with next_attempt_at as the lease expiry; the
+claim commits before any SMTP traffic, so no lock or connection is held
+while sending. Each result is then recorded in its own short transaction.
+Messages are sent over one pooled SMTP connection (app.mail_transport), and
+failures are retried with exponential backoff. A row whose lease expires
+(worker died mid-batch) is claimed again, so delivery is at-least-once.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import smtplib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from .database import SessionLocal
+from .mail_transport import build_message, mail_transport
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true").lower() == "true"
+# Fallback poll interval; enqueuing code wakes the sender immediately via notify()
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30"))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_OUTBOX_RETRY_MAX_SECONDS", "3600"))
+# How long a claimed batch is reserved for the worker sending it
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(EMAIL_OUTBOX_RETRY_MAX_SECONDS, EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+@dataclass(frozen=True)
+class ClaimedEmail:
+    """Detached copy of a leased outbox row, safe to use without a session"""
+    id: int
+    to_email: str
+    subject: str
+    body_text: str
+    body_html: Optional[str]
+
+
+class OutboxSender:
+    """Background task draining the email_outbox table"""
+
+    def __init__(
+        self,
+        batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+        poll_interval: float = EMAIL_OUTBOX_POLL_SECONDS,
+        max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS,
+        lease_seconds: float = EMAIL_OUTBOX_LEASE_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+
+    # ---- Delivery ----
+
+    def _schedule_retry(self, row: EmailOutbox, error: Exception, permanent: bool = False) -> None:
+        row.attempts = (row.attempts or 0) + 1
+        row.last_error = str(error)[:1000]
+        if permanent or row.attempts >= self.max_attempts:
+            row.status = "failed"
+            self.failed += 1
+            logger.error(f"Giving up on email {row.id} to {row.to_email}: {error}")
+        else:
+            row.status = "pending"
+            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_delay(row.attempts))
+            self.retried += 1
+            logger.warning(f"Email {row.id} failed (attempt {row.attempts}), retrying later: {error}")
+
+    def _mark_sent(self, row: EmailOutbox) -> None:
+        row.status = "sent"
+        row.sent_at = datetime.utcnow()
+        row.attempts = (row.attempts or 0) + 1
+        self.sent += 1
+
+    def claim_batch(self) -> List[ClaimedEmail]:
+        """
+        Lease up to batch_size due rows (pending, or sending with an expired
+        lease) and commit, so the row locks are released before sending.
+
+        Returns:
+            Detached copies of the claimed rows
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            rows = (
+                db.query(EmailOutbox)
+                .filter(EmailOutbox.status.in_(("pending", "sending")), EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = [
+                ClaimedEmail(row.id, row.to_email, row.subject, row.body_text, row.body_html)
+                for row in rows
+            ]
+            lease_until = now + timedelta(seconds=self.lease_seconds)
+            for row in rows:
+                row.status = "sending"
+                row.next_attempt_at = lease_until
+            db.commit()
+            return claimed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _record(self, email_id: int, update: Callable[[EmailOutbox], None]) -> None:
+        """Apply one send result to a leased row in a short transaction"""
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(EmailOutbox)
+                .filter(EmailOutbox.id == email_id, EmailOutbox.status == "sending")
+                .first()
+            )
+            if row is not None:
+                update(row)
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _release(self, email_ids: List[int]) -> None:
+        """Hand leased but unsent rows back for the next poll"""
+        if not email_ids:
+            return
+        db = SessionLocal()
+        try:
+            db.query(EmailOutbox).filter(
+                EmailOutbox.id.in_(email_ids), EmailOutbox.status == "sending"
+            ).update(
+                {EmailOutbox.status: "pending", EmailOutbox.next_attempt_at: datetime.utcnow()},
+                synchronize_session=False,
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def send_batch(self) -> int:
+        """
+        Claim and send one batch of due messages (blocking; runs in a thread).
+
+        Returns:
+            Number of rows claimed
+        """
+        claimed = self.claim_batch()
+        if not claimed:
+            return 0
+
+        for index, email in enumerate(claimed):
+            try:
+                mail_transport.send(build_message(email.to_email, email.subject, email.body_text, email.body_html))
+            except smtplib.SMTPRecipientsRefused as e:
+                self._record(email.id, lambda row: self._schedule_retry(row, e, permanent=True))
+            except (OSError, smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected) as e:
+                # Server unreachable: back off this row, release the rest for the next poll
+                self._record(email.id, lambda row: self._schedule_retry(row, e))
+                self._release([other.id for other in claimed[index + 1:]])
+                break
+            except Exception as e:
+                self._record(email.id, lambda row: self._schedule_retry(row, e))
+            else:
+                self._record(email.id, self._mark_sent)
+
+        self.batches += 1
+        return len(claimed)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await run_in_threadpool(self.send_batch)
+            except Exception as e:
+                logger.error(f"Email outbox error: {str(e)}")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue  # more rows are probably due
+
+            await run_in_threadpool(mail_transport.close_idle)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    # ---- Lifecycle ----
+
+    def notify(self) -> None:
+        """Wake the sender after committing new outbox rows"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background sender (no-op when EMAIL_OUTBOX_ENABLED is false)"""
+        if not EMAIL_OUTBOX_ENABLED or self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "batches": self.batches,
+        }
+
+
+outbox_sender = OutboxSender()
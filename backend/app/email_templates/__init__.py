@@ -0,0 +1,109 @@
+"""
+Localized Email Templates
+
+Templates live in ``<language>/<name>.txt`` (first line ``Subject: ...``,
+then a blank line and the plain-text body) with an optional
+``<language>/<name>.html``. All of them are read and compiled into
+``string.Template`` objects once at startup; rendering a message only
+substitutes variables, HTML-escaping them for the HTML part.
+"""
+
+import html
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent
+DEFAULT_LANGUAGE = "en"
+# Languages without their own templates that read another one better than English
+LANGUAGE_FALLBACKS = {"nds": "de"}
+
+
+@dataclass(frozen=True)
+class CompiledEmailTemplate:
+    subject: Template
+    text: Template
+    html: Optional[Template] = None
+
+
+def _compile(text_path: Path) -> CompiledEmailTemplate:
+    header, _, body = text_path.read_text(encoding="utf-8").partition("\n\n")
+    if not header.startswith("Subject:"):
+        raise ValueError(f"{text_path} must start with a 'Subject:' line")
+    html_path = text_path.with_suffix(".html")
+    return CompiledEmailTemplate(
+        subject=Template(header[len("Subject:"):].strip()),
+        text=Template(body),
+        html=Template(html_path.read_text(encoding="utf-8")) if html_path.exists() else None,
+    )
+
+
+class EmailTemplateRegistry:
+    """Compiled templates keyed by (language, template name)"""
+
+    def __init__(self, directory: Path = TEMPLATE_DIR):
+        self.directory = directory
+        self._templates: Dict[Tuple[str, str], CompiledEmailTemplate] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """(Re)load and compile every template on disk"""
+        templates = {}
+        for text_path in sorted(self.directory.glob("*/*.txt")):
+            templates[(text_path.parent.name, text_path.stem)] = _compile(text_path)
+        with self._lock:
+            self._templates = templates
+            self._loaded = True
+        logger.info(f"Loaded {len(templates)} email templates")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @property
+    def languages(self) -> set:
+        self._ensure_loaded()
+        return {language for language, _ in self._templates}
+
+    def get(self, name: str, language: str) -> CompiledEmailTemplate:
+        """
+        Template for a language, falling back to LANGUAGE_FALLBACKS and then
+        DEFAULT_LANGUAGE.
+
+        Raises:
+            KeyError: If the template does not exist at all
+        """
+        self._ensure_loaded()
+        for candidate in (language, LANGUAGE_FALLBACKS.get(language), DEFAULT_LANGUAGE):
+            template = self._templates.get((candidate, name))
+            if template is not None:
+                return template
+        raise KeyError(f"Unknown email template: {name}")
+
+    def render(self, name: str, language: str, **variables) -> Tuple[str, str, Optional[str]]:
+        """
+        Render a template.
+
+        Returns:
+            (subject, plain text body, HTML body or None)
+        """
+        template = self.get(name, language)
+        html_body = None
+        if template.html is not None:
+            escaped = {key: html.escape(str(value)) for key, value in variables.items()}
+            html_body = template.html.substitute(escaped)
+        return template.subject.substitute(variables), template.text.substitute(variables), html_body
+
+
+email_templates = EmailTemplateRegistry()
+
+
+def render_email(name: str, language: str, **variables) -> Tuple[str, str, Optional[str]]:
+    """Render a localized email; see EmailTemplateRegistry.render"""
+    return email_templates.render(name, language, **variables)
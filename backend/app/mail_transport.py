@@ -0,0 +1,244 @@
+"""
+Mail Transport
+
+One pool of authenticated SMTP connections for everything that sends mail
+(email_config.send_email, email_verification and the email outbox). Idle
+connections are kept warm and reused; before reuse they are recycled when
+too old or too busy and NOOP-checked when they sat idle, so callers skip
+the TCP + STARTTLS + AUTH handshake on most sends.
+"""
+
+import asyncio
+import logging
+import os
+import smtplib
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from .email_config import EmailConfig
+
+logger = logging.getLogger(__name__)
+
+# Maximum simultaneously open SMTP connections (per process)
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+# Seconds to wait for a free connection before giving up
+SMTP_POOL_TIMEOUT = float(os.getenv("SMTP_POOL_TIMEOUT", "30"))
+# Recycle connections older than this or after this many messages
+SMTP_MAX_CONNECTION_AGE = float(os.getenv("SMTP_MAX_CONNECTION_AGE", "300"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+# Idle connections are NOOP-checked before reuse and closed after SMTP_IDLE_TIMEOUT
+SMTP_HEALTH_CHECK_AFTER = float(os.getenv("SMTP_HEALTH_CHECK_AFTER", "10"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+
+
+def build_message(to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> MIMEMultipart:
+    """Build a multipart/alternative message from the configured sender"""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = f"{EmailConfig.FROM_NAME} <{EmailConfig.FROM_EMAIL}>"
+    msg["To"] = to_email
+    msg["Message-ID"] = f"<{uuid.uuid4()}@reste-rampe.tech>"
+    msg["Date"] = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000")
+    msg.attach(MIMEText(body, "plain"))
+    if html_body:
+        msg.attach(MIMEText(html_body, "html"))
+    return msg
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.messages = 0
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of logged-in SMTP connections"""
+
+    def __init__(self, size: int = SMTP_POOL_SIZE):
+        self.size = size
+        self._idle: Deque[_PooledConnection] = deque()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.sent = 0
+        self.errors = 0
+        self.connects = 0
+        self.reuses = 0
+        self.recycled = 0
+        self.health_check_failures = 0
+        self._started_at = time.monotonic()
+        self._send_time = 0.0
+
+    # ---- Connections ----
+
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(EmailConfig.SMTP_HOST, EmailConfig.SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if EmailConfig.SMTP_TLS:
+                smtp.starttls()
+            if EmailConfig.SMTP_USER:
+                smtp.login(EmailConfig.SMTP_USER, EmailConfig.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connects += 1
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _close(conn: _PooledConnection) -> None:
+        try:
+            conn.smtp.quit()
+        except Exception:
+            conn.smtp.close()
+
+    def _usable(self, conn: _PooledConnection) -> bool:
+        """Whether an idle connection may be reused (closes it if not)"""
+        now = time.monotonic()
+        if (
+            now - conn.created_at > SMTP_MAX_CONNECTION_AGE
+            or conn.messages >= SMTP_MAX_MESSAGES_PER_CONNECTION
+            or now - conn.last_used > SMTP_IDLE_TIMEOUT
+        ):
+            with self._lock:
+                self.recycled += 1
+            self._close(conn)
+            return False
+        if now - conn.last_used > SMTP_HEALTH_CHECK_AFTER:
+            try:
+                if conn.smtp.noop()[0] != 250:
+                    raise smtplib.SMTPException("NOOP rejected")
+            except Exception:
+                with self._lock:
+                    self.health_check_failures += 1
+                conn.smtp.close()
+                return False
+        return True
+
+    def _checkout(self, fresh: bool = False) -> _PooledConnection:
+        if fresh:
+            return self._connect()
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if self._usable(conn):
+                with self._lock:
+                    self.reuses += 1
+                return conn
+
+    @contextmanager
+    def connection(self, fresh: bool = False) -> Iterator[smtplib.SMTP]:
+        """
+        Borrow a connection; it returns to the pool unless the block raised.
+
+        Args:
+            fresh: Open a new connection instead of reusing an idle one
+
+        Raises:
+            TimeoutError: If no connection slot frees up within SMTP_POOL_TIMEOUT
+        """
+        if not self._slots.acquire(timeout=SMTP_POOL_TIMEOUT):
+            raise TimeoutError("No SMTP connection available")
+        conn = None
+        try:
+            conn = self._checkout(fresh)
+            yield conn.smtp
+        except Exception:
+            if conn is not None:
+                conn.smtp.close()
+            raise
+        else:
+            conn.messages += 1
+            conn.last_used = time.monotonic()
+            with self._lock:
+                self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    # ---- Sending ----
+
+    def send(self, msg: MIMEMultipart) -> None:
+        """
+        Send a message (blocking).
+
+        A connection the server already dropped is replaced once.
+
+        Raises:
+            smtplib.SMTPException, OSError: If delivery to the server failed
+        """
+        started = time.perf_counter()
+        try:
+            try:
+                with self.connection() as smtp:
+                    smtp.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                with self.connection(fresh=True) as smtp:
+                    smtp.send_message(msg)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        with self._lock:
+            self.sent += 1
+            self._send_time += time.perf_counter() - started
+
+    async def send_async(self, msg: MIMEMultipart) -> None:
+        """send() on the transport's own threads, without blocking the event loop"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="smtp")
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.send, msg)
+
+    # ---- Lifecycle ----
+
+    def close_idle(self) -> int:
+        """Close idle connections past SMTP_IDLE_TIMEOUT; returns how many"""
+        cutoff = time.monotonic() - SMTP_IDLE_TIMEOUT
+        with self._lock:
+            stale = [conn for conn in self._idle if conn.last_used < cutoff]
+            for conn in stale:
+                self._idle.remove(conn)
+        for conn in stale:
+            self._close(conn)
+        return len(stale)
+
+    def close(self) -> None:
+        """Close all idle connections and the executor (application shutdown)"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            self._close(conn)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = time.monotonic() - self._started_at
+            return {
+                "pool_size": self.size,
+                "idle_connections": len(self._idle),
+                "sent": self.sent,
+                "errors": self.errors,
+                "connects": self.connects,
+                "reuses": self.reuses,
+                "recycled": self.recycled,
+                "health_check_failures": self.health_check_failures,
+                "avg_send_ms": round(self._send_time / self.sent * 1000, 3) if self.sent else 0.0,
+                "messages_per_minute": round(self.sent / uptime * 60, 3) if uptime else 0.0,
+            }
+
+
+mail_transport = SMTPConnectionPool()
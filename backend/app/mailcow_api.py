@@ -3,11 +3,18 @@ Mailcow REST API Integration Module
 
 Handles all interactions with Mailcow API for mailbox management,
 quotas, forwarding, and admin operations.
+
+Each operation is described once as a MailcowCall (request plus how to read
+its response) by MailcowClientBase; MailcowAPI (requests) and
+AsyncMailcowAPI (pooled httpx) only differ in how they send it.
 """
 
+import asyncio
 import os
+import httpx
 import requests
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
 import logging
 
@@ -22,9 +29,88 @@ MAILCOW_API_TIMEOUT = 10
 # Disable SSL verification for self-signed certs (only in dev!)
 MAILCOW_VERIFY_SSL = os.getenv("MAILCOW_VERIFY_SSL", "false").lower() == "true"
 
+# Connection pool for the shared async client (AsyncMailcowAPI)
+MAILCOW_POOL_MAX_CONNECTIONS = int(os.getenv("MAILCOW_POOL_MAX_CONNECTIONS", "20"))
+MAILCOW_POOL_MAX_KEEPALIVE = int(os.getenv("MAILCOW_POOL_MAX_KEEPALIVE", "10"))
+MAILCOW_POOL_KEEPALIVE_EXPIRY = float(os.getenv("MAILCOW_POOL_KEEPALIVE_EXPIRY", "30"))
+# Maximum in-flight requests against the Mailcow host
+MAILCOW_MAX_CONCURRENT_REQUESTS = int(os.getenv("MAILCOW_MAX_CONCURRENT_REQUESTS", "10"))
 
-class MailcowAPI:
-    """Mailcow REST API Client"""
+
+def _check_response_status(status_code: int, text: str) -> None:
+    """Raise for Mailcow error responses (shared by sync and async clients)"""
+    if status_code == 401:
+        logger.error("Mailcow API: Invalid API key")
+        raise Exception("Mailcow API: Invalid API key")
+
+    if status_code == 403:
+        logger.error("Mailcow API: Access denied")
+        raise Exception("Mailcow API: Access denied")
+
+    if status_code >= 400:
+        logger.error(f"Mailcow API Error {status_code}: {text}")
+        raise Exception(f"Mailcow API Error: {status_code}")
+
+
+def _read_response(method: str, endpoint: str, status_code: int, text: str, read_json: Callable[[], Any]) -> Any:
+    """Log, check and decode a Mailcow response (shared by sync and async clients)"""
+    logger.debug(f"Mailcow API {method} {endpoint}: {status_code}")
+    _check_response_status(status_code, text)
+    return read_json()
+
+
+def _connection_error(error: Exception) -> Exception:
+    """Map a transport error (requests or httpx) to the client's error"""
+    logger.error(f"Mailcow API request failed: {str(error)}")
+    return Exception(f"Mailcow API connection error: {str(error)}")
+
+
+def _is_success(result: Any) -> bool:
+    """Mailcow returns {"status": "success", "msg": [...]} for write operations"""
+    return isinstance(result, dict) and result.get("status") == "success"
+
+
+def _quota_from_details(details: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """Quota usage from mailbox details (Mailcow reports bytes)"""
+    if not details:
+        return None
+    quota_total = details.get("quota", 0)
+    quota_used = details.get("bytes", 0)
+    return {
+        "quota_total": quota_total,
+        "quota_used": quota_used,
+        "quota_percent": int((quota_used / quota_total * 100)) if quota_total > 0 else 0,
+    }
+
+
+@dataclass(frozen=True)
+class MailcowCall:
+    """One API operation: the request to send and how to read its response"""
+    method: str
+    endpoint: str
+    action: str  # for log messages, e.g. "Create mailbox x@example.org"
+    payload: Optional[Dict[str, Any]] = None
+    parse: Callable[[Any], Any] = lambda result: result
+    default: Any = None  # returned when the request fails
+
+    def failed(self, error: Exception) -> Any:
+        logger.error(f"{self.action} failed: {str(error)}")
+        return self.default
+
+
+def _write_result(action: str) -> Callable[[Any], bool]:
+    """Parser for write operations: True if Mailcow accepted it"""
+    def parse(result: Any) -> bool:
+        if _is_success(result):
+            logger.info(action)
+            return True
+        logger.warning(f"{action} failed: {result}")
+        return False
+    return parse
+
+
+class MailcowClientBase:
+    """Configuration plus the request/response definition of every operation"""
 
     def __init__(self):
         self.base_url = MAILCOW_API_URL.rstrip("/")
@@ -39,6 +125,124 @@ class MailcowAPI:
             "Content-Type": "application/json",
         }
 
+    def _mailbox_email(self, username: str) -> str:
+        return f"{username}@{self.domain}"
+
+    def _write(self, endpoint: str, payload: Dict[str, Any], action: str) -> MailcowCall:
+        return MailcowCall("POST", endpoint, action, payload=payload, parse=_write_result(action), default=False)
+
+    # ==================== MAILBOX OPERATIONS ====================
+
+    def _create_mailbox_call(
+        self, username: str, password: str, display_name: Optional[str], quota_mb: int
+    ) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {
+            "username": mailbox_email,
+            "password": password,
+            "password2": password,
+            "mailbox": mailbox_email,
+            "name": display_name or username,
+            "quota": quota_mb * 1024 * 1024,  # Convert MB to bytes
+            "active": 1,
+            "force_pw_update": 0,
+            "sogo_access": 1,
+        }
+        return self._write("/add/mailbox", payload, f"Create mailbox {mailbox_email}")
+
+    def _delete_mailbox_call(self, username: str) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        return self._write("/delete/mailbox", {"username": [mailbox_email]}, f"Delete mailbox {mailbox_email}")
+
+    def _mailbox_details_call(self, username: str) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+
+        def parse(result: Any) -> Optional[Dict[str, Any]]:
+            # Mailcow returns list with one item
+            if isinstance(result, list) and len(result) > 0:
+                return result[0]
+            logger.warning(f"Mailbox not found: {mailbox_email}")
+            return None
+
+        return MailcowCall("GET", f"/get/mailbox/{mailbox_email}", f"Get mailbox details for {mailbox_email}", parse=parse)
+
+    # ==================== FORWARDING OPERATIONS ====================
+
+    def _add_forwarding_call(self, username: str, forward_to: str, keep_local: bool) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {
+            "forwarding": mailbox_email,
+            "forwarding_dest": forward_to,
+            "keep": 1 if keep_local else 0,
+        }
+        return self._write("/add/forwarding", payload, f"Add forwarding {mailbox_email} → {forward_to}")
+
+    def _remove_forwarding_call(self, username: str, forward_to: str) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {
+            "forwarding": mailbox_email,
+            "forwarding_dest": forward_to,
+        }
+        return self._write("/delete/forwarding", payload, f"Remove forwarding {mailbox_email} → {forward_to}")
+
+    def _forwarding_rules_call(self, username: str) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+
+        def parse(result: Any) -> Optional[List[str]]:
+            if isinstance(result, list):
+                return [item.get("forwarding_dest") for item in result if item.get("forwarding_dest")]
+            return None
+
+        return MailcowCall("GET", f"/get/forwarding/{mailbox_email}", f"Get forwarding rules for {mailbox_email}", parse=parse)
+
+    # ==================== PASSWORD OPERATIONS ====================
+
+    def _set_password_call(self, username: str, password: str) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {
+            "username": mailbox_email,
+            "password": password,
+            "password2": password,
+        }
+        return self._write("/edit/mailbox", payload, f"Change password for {mailbox_email}")
+
+    # ==================== ADMIN OPERATIONS ====================
+
+    def _all_mailboxes_call(self) -> MailcowCall:
+        def parse(result: Any) -> Optional[List[Dict[str, Any]]]:
+            if isinstance(result, list):
+                # Filter to only our domain
+                return [m for m in result if self.domain in m.get("username", "")]
+            return None
+
+        return MailcowCall("GET", "/get/mailbox/all", "Get all mailboxes", parse=parse)
+
+    def _set_active_call(self, username: str, active: bool) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {"username": mailbox_email, "active": 1 if active else 0}
+        return self._write("/edit/mailbox", payload, f"{'Enable' if active else 'Disable'} mailbox {mailbox_email}")
+
+    def _set_quota_call(self, username: str, quota_mb: int) -> MailcowCall:
+        mailbox_email = self._mailbox_email(username)
+        payload = {
+            "username": mailbox_email,
+            "quota": quota_mb * 1024 * 1024,  # Convert MB to bytes
+        }
+        return self._write("/edit/mailbox", payload, f"Set quota for {mailbox_email} to {quota_mb}MB")
+
+    # ==================== CONNECTION TEST ====================
+
+    def _test_connection_call(self) -> MailcowCall:
+        def parse(result: Any) -> bool:
+            logger.info("✅ Mailcow API connection successful")
+            return True
+
+        return MailcowCall("GET", "/get/mailbox/all", "❌ Mailcow API connection test", parse=parse, default=False)
+
+
+class MailcowAPI(MailcowClientBase):
+    """Mailcow REST API Client"""
+
     def _make_request(
         self,
         method: str,
@@ -61,39 +265,27 @@ class MailcowAPI:
         Raises:
             Exception: If API request fails
         """
-        url = f"{self.base_url}{endpoint}"
-
         try:
             response = requests.request(
                 method=method,
-                url=url,
+                url=f"{self.base_url}{endpoint}",
                 json=data,
                 params=params,
                 headers=self._headers(),
                 timeout=MAILCOW_API_TIMEOUT,
                 verify=self.verify_ssl,
             )
+        except requests.RequestException as e:
+            raise _connection_error(e)
 
-            # Log the request
-            logger.debug(f"Mailcow API {method} {endpoint}: {response.status_code}")
-
-            if response.status_code == 401:
-                logger.error("Mailcow API: Invalid API key")
-                raise Exception("Mailcow API: Invalid API key")
-
-            if response.status_code == 403:
-                logger.error("Mailcow API: Access denied")
-                raise Exception("Mailcow API: Access denied")
-
-            if response.status_code >= 400:
-                logger.error(f"Mailcow API Error {response.status_code}: {response.text}")
-                raise Exception(f"Mailcow API Error: {response.status_code}")
-
-            return response.json()
+        return _read_response(method, endpoint, response.status_code, response.text, response.json)
 
-        except requests.RequestException as e:
-            logger.error(f"Mailcow API request failed: {str(e)}")
-            raise Exception(f"Mailcow API connection error: {str(e)}")
+    def _call(self, call: MailcowCall) -> Any:
+        """Run one operation; errors are logged and yield call.default"""
+        try:
+            return call.parse(self._make_request(call.method, call.endpoint, data=call.payload))
+        except Exception as e:
+            return call.failed(e)
 
     # ==================== MAILBOX OPERATIONS ====================
 
@@ -116,34 +308,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "username": mailbox_email,
-                "password": password,
-                "password2": password,
-                "mailbox": mailbox_email,
-                "name": display_name or username,
-                "quota": quota_mb * 1024 * 1024,  # Convert MB to bytes
-                "active": 1,
-                "force_pw_update": 0,
-                "sogo_access": 1,
-            }
-
-            result = self._make_request("POST", "/add/mailbox", data=payload)
-
-            # Mailcow returns {"status": "success", "msg": [...]}
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Created mailbox: {mailbox_email}")
-                return True
-
-            logger.warning(f"Mailbox creation failed: {result}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to create mailbox for {username}: {str(e)}")
-            return False
+        return self._call(self._create_mailbox_call(username, password, display_name, quota_mb))
 
     def delete_mailbox(self, username: str) -> bool:
         """
@@ -155,23 +320,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {"username": [mailbox_email]}
-
-            result = self._make_request("POST", "/delete/mailbox", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Deleted mailbox: {mailbox_email}")
-                return True
-
-            logger.warning(f"Mailbox deletion failed: {result}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to delete mailbox for {username}: {str(e)}")
-            return False
+        return self._call(self._delete_mailbox_call(username))
 
     def get_mailbox_details(self, username: str) -> Optional[Dict[str, Any]]:
         """
@@ -183,21 +332,7 @@ class MailcowAPI:
         Returns:
             Mailbox details dict, or None if not found/error
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            result = self._make_request("GET", f"/get/mailbox/{mailbox_email}")
-
-            # Mailcow returns list with one item
-            if isinstance(result, list) and len(result) > 0:
-                return result[0]
-
-            logger.warning(f"Mailbox not found: {mailbox_email}")
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get mailbox details for {username}: {str(e)}")
-            return None
+        return self._call(self._mailbox_details_call(username))
 
     def get_mailbox_quota(self, username: str) -> Optional[Dict[str, int]]:
         """
@@ -209,24 +344,7 @@ class MailcowAPI:
         Returns:
             Dict with 'quota_total' and 'quota_used' in bytes, or None if error
         """
-        try:
-            details = self.get_mailbox_details(username)
-            if not details:
-                return None
-
-            # Mailcow returns quota in bytes
-            quota_total = details.get("quota", 0)
-            quota_used = details.get("bytes", 0)
-
-            return {
-                "quota_total": quota_total,
-                "quota_used": quota_used,
-                "quota_percent": int((quota_used / quota_total * 100)) if quota_total > 0 else 0,
-            }
-
-        except Exception as e:
-            logger.error(f"Failed to get quota for {username}: {str(e)}")
-            return None
+        return _quota_from_details(self.get_mailbox_details(username))
 
     # ==================== FORWARDING OPERATIONS ====================
 
@@ -247,27 +365,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "forwarding": mailbox_email,
-                "forwarding_dest": forward_to,
-                "keep": 1 if keep_local else 0,
-            }
-
-            result = self._make_request("POST", "/add/forwarding", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Added forwarding: {mailbox_email} → {forward_to}")
-                return True
-
-            logger.warning(f"Forwarding creation failed: {result}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to add forwarding for {username}: {str(e)}")
-            return False
+        return self._call(self._add_forwarding_call(username, forward_to, keep_local))
 
     def remove_forwarding(self, username: str, forward_to: str) -> bool:
         """
@@ -280,26 +378,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "forwarding": mailbox_email,
-                "forwarding_dest": forward_to,
-            }
-
-            result = self._make_request("POST", "/delete/forwarding", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Removed forwarding: {mailbox_email} → {forward_to}")
-                return True
-
-            logger.warning(f"Forwarding removal failed: {result}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to remove forwarding for {username}: {str(e)}")
-            return False
+        return self._call(self._remove_forwarding_call(username, forward_to))
 
     def get_forwarding_rules(self, username: str) -> Optional[List[str]]:
         """
@@ -311,19 +390,7 @@ class MailcowAPI:
         Returns:
             List of forwarding destinations, or None if error
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            result = self._make_request("GET", f"/get/forwarding/{mailbox_email}")
-
-            if isinstance(result, list):
-                return [item.get("forwarding_dest") for item in result if item.get("forwarding_dest")]
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get forwarding rules for {username}: {str(e)}")
-            return None
+        return self._call(self._forwarding_rules_call(username))
 
     # ==================== PASSWORD OPERATIONS ====================
 
@@ -338,27 +405,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "username": mailbox_email,
-                "password": password,
-                "password2": password,
-            }
-
-            result = self._make_request("POST", "/edit/mailbox", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Changed password for mailbox: {mailbox_email}")
-                return True
-
-            logger.warning(f"Password change failed: {result}")
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to change password for {username}: {str(e)}")
-            return False
+        return self._call(self._set_password_call(username, password))
 
     # ==================== ADMIN OPERATIONS ====================
 
@@ -369,18 +416,7 @@ class MailcowAPI:
         Returns:
             List of mailbox dicts, or None if error
         """
-        try:
-            result = self._make_request("GET", "/get/mailbox/all")
-
-            if isinstance(result, list):
-                # Filter to only our domain
-                return [m for m in result if self.domain in m.get("username", "")]
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get all mailboxes: {str(e)}")
-            return None
+        return self._call(self._all_mailboxes_call())
 
     def disable_mailbox(self, username: str) -> bool:
         """
@@ -392,25 +428,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "username": mailbox_email,
-                "active": 0,
-            }
-
-            result = self._make_request("POST", "/edit/mailbox", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Disabled mailbox: {mailbox_email}")
-                return True
-
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to disable mailbox for {username}: {str(e)}")
-            return False
+        return self._call(self._set_active_call(username, False))
 
     def enable_mailbox(self, username: str) -> bool:
         """
@@ -422,25 +440,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "username": mailbox_email,
-                "active": 1,
-            }
-
-            result = self._make_request("POST", "/edit/mailbox", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Enabled mailbox: {mailbox_email}")
-                return True
-
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to enable mailbox for {username}: {str(e)}")
-            return False
+        return self._call(self._set_active_call(username, True))
 
     def set_mailbox_quota(self, username: str, quota_mb: int) -> bool:
         """
@@ -453,25 +453,7 @@ class MailcowAPI:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            mailbox_email = f"{username}@{self.domain}"
-
-            payload = {
-                "username": mailbox_email,
-                "quota": quota_mb * 1024 * 1024,  # Convert MB to bytes
-            }
-
-            result = self._make_request("POST", "/edit/mailbox", data=payload)
-
-            if isinstance(result, dict) and result.get("status") == "success":
-                logger.info(f"Set quota for {mailbox_email}: {quota_mb}MB")
-                return True
-
-            return False
-
-        except Exception as e:
-            logger.error(f"Failed to set quota for {username}: {str(e)}")
-            return False
+        return self._call(self._set_quota_call(username, quota_mb))
 
     # ==================== CONNECTION TEST ====================
 
@@ -482,10 +464,154 @@ class MailcowAPI:
         Returns:
             True if connection successful, False otherwise
         """
+        return self._call(self._test_connection_call())
+
+
+class AsyncMailcowAPI(MailcowClientBase):
+    """
+    Async Mailcow REST API Client
+
+    Same operations as MailcowAPI on top of a single long-lived
+    httpx.AsyncClient so keep-alive connections (and their TLS sessions) are
+    reused across requests. One instance is shared for the application
+    lifetime, see get_async_mailcow_client().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(MAILCOW_MAX_CONCURRENT_REQUESTS)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers(),
+                verify=self.verify_ssl,
+                timeout=MAILCOW_API_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAILCOW_POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=MAILCOW_POOL_MAX_KEEPALIVE,
+                    keepalive_expiry=MAILCOW_POOL_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+    ) -> Dict[str, Any]:
+        """Async counterpart of MailcowAPI._make_request"""
         try:
-            result = self._make_request("GET", "/get/mailbox/all")
-            logger.info("✅ Mailcow API connection successful")
-            return True
+            async with self._semaphore:
+                response = await self.client.request(method, endpoint, json=data, params=params)
+        except httpx.HTTPError as e:
+            raise _connection_error(e)
+
+        return _read_response(method, endpoint, response.status_code, response.text, response.json)
+
+    async def _call(self, call: MailcowCall) -> Any:
+        """Run one operation; errors are logged and yield call.default"""
+        try:
+            return call.parse(await self._make_request(call.method, call.endpoint, data=call.payload))
         except Exception as e:
-            logger.error(f"❌ Mailcow API connection failed: {str(e)}")
-            return False
+            return call.failed(e)
+
+    # ==================== MAILBOX OPERATIONS ====================
+
+    async def create_mailbox(
+        self,
+        username: str,
+        password: str,
+        display_name: Optional[str] = None,
+        quota_mb: int = 5120,
+    ) -> bool:
+        """Create a new mailbox in Mailcow (see MailcowAPI.create_mailbox)"""
+        return await self._call(self._create_mailbox_call(username, password, display_name, quota_mb))
+
+    async def delete_mailbox(self, username: str) -> bool:
+        """Delete a mailbox from Mailcow"""
+        return await self._call(self._delete_mailbox_call(username))
+
+    async def get_mailbox_details(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get mailbox details from Mailcow, or None if not found/error"""
+        return await self._call(self._mailbox_details_call(username))
+
+    async def get_mailbox_quota(self, username: str) -> Optional[Dict[str, int]]:
+        """Get mailbox quota usage ('quota_total'/'quota_used' in bytes)"""
+        return _quota_from_details(await self.get_mailbox_details(username))
+
+    # ==================== FORWARDING OPERATIONS ====================
+
+    async def add_forwarding(self, username: str, forward_to: str, keep_local: bool = True) -> bool:
+        """Add email forwarding rule"""
+        return await self._call(self._add_forwarding_call(username, forward_to, keep_local))
+
+    async def remove_forwarding(self, username: str, forward_to: str) -> bool:
+        """Remove email forwarding rule"""
+        return await self._call(self._remove_forwarding_call(username, forward_to))
+
+    async def get_forwarding_rules(self, username: str) -> Optional[List[str]]:
+        """Get all forwarding destinations for a mailbox, or None if error"""
+        return await self._call(self._forwarding_rules_call(username))
+
+    # ==================== PASSWORD OPERATIONS ====================
+
+    async def set_mailbox_password(self, username: str, password: str) -> bool:
+        """Change mailbox password"""
+        return await self._call(self._set_password_call(username, password))
+
+    # ==================== ADMIN OPERATIONS ====================
+
+    async def get_all_mailboxes(self) -> Optional[List[Dict[str, Any]]]:
+        """Get all mailboxes in the domain (Admin only), or None if error"""
+        return await self._call(self._all_mailboxes_call())
+
+    async def disable_mailbox(self, username: str) -> bool:
+        """Disable a mailbox (Admin only)"""
+        return await self._call(self._set_active_call(username, False))
+
+    async def enable_mailbox(self, username: str) -> bool:
+        """Enable a mailbox (Admin only)"""
+        return await self._call(self._set_active_call(username, True))
+
+    async def set_mailbox_quota(self, username: str, quota_mb: int) -> bool:
+        """Set mailbox quota in megabytes (Admin only)"""
+        return await self._call(self._set_quota_call(username, quota_mb))
+
+    # ==================== CONNECTION TEST ====================
+
+    async def test_connection(self) -> bool:
+        """Test Mailcow API connectivity and authentication"""
+        return await self._call(self._test_connection_call())
+
+
+# Shared async client for the application lifetime
+_async_client: Optional[AsyncMailcowAPI] = None
+
+
+def get_async_mailcow_client() -> AsyncMailcowAPI:
+    """Return the process-wide AsyncMailcowAPI instance"""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncMailcowAPI()
+    return _async_client
+
+
+async def close_async_mailcow_client() -> None:
+    """Release pooled Mailcow connections (called on application shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -1,11 +1,21 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from app.database import engine, Base, dispose_async_engine, pool_status
+from app.auth import password_hasher, token_cache
+from app.email_outbox import outbox_sender
+from app.email_templates import email_templates
+from app.mail_transport import mail_transport
+from app.mailcow_api import close_async_mailcow_client
+from app.services.mailbox_inventory import mailbox_inventory
+from app.services.page_cache import page_cache
+from app.services.ai_gemini import model_registry
+from app.services.recipe_jobs import recipe_jobs
 from app.routers import ingredients, auth, shopping_lists, recipes, users
 from app.routers import news as news_router
 from app.routers import pages as pages_router
 from app.routers import mailbox as mailbox_router
 from app.routers import admin_mailbox as admin_mailbox_router
+from app.routers.admin_mailbox import check_admin
 import os
 
 
@@ -24,6 +34,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
     )
 
     # include routers
@@ -41,11 +52,43 @@ def create_app() -> FastAPI:
     def on_startup():
         # Create tables if they don't exist (using updated SQLAlchemy models with user_id)
         Base.metadata.create_all(bind=engine)
+        email_templates.load()
+
+    @app.on_event("startup")
+    async def start_background_tasks():
+        mailbox_inventory.start()
+        model_registry.start()
+        outbox_sender.start()
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        await mailbox_inventory.stop()
+        await outbox_sender.stop()
+        mail_transport.close()
+        model_registry.stop()
+        recipe_jobs.shutdown()
+        password_hasher.shutdown()
+        await close_async_mailcow_client()
+        await dispose_async_engine()
 
     @app.get("/api/health")
     def health():
         return {"status": "ok"}
 
+    @app.get("/api/metrics", dependencies=[Depends(check_admin)])
+    def metrics():
+        """In-process counters for monitoring (admin only)"""
+        return {
+            "auth_token_cache": token_cache.stats(),
+            "database_pool": pool_status(),
+            "email_outbox": outbox_sender.stats(),
+            "mail_transport": mail_transport.stats(),
+            "page_cache": page_cache.stats(),
+            "password_hashing": password_hasher.stats(),
+            "gemini_models": model_registry.status(),
+            "recipe_jobs": recipe_jobs.stats(),
+        }
+
     return app
 
 
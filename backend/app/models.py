@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Date, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, Boolean, Date, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -60,6 +60,11 @@ class ShoppingItem(Base):
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination: newest first within a language (optionally healthy only)
+        Index("ix_recipes_language_created_id", "language", "created_at", "id"),
+        Index("ix_recipes_language_healthy_created_id", "language", "is_healthy", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(300), nullable=False)
@@ -72,6 +77,49 @@ class Recipe(Base):
     language = Column(String(10), default="de", nullable=False)  # Language code (de, en, fr, etc)
     is_healthy = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    ingredient_items = relationship(
+        "RecipeIngredient",
+        back_populates="recipe",
+        cascade="all, delete-orphan",
+        order_by="RecipeIngredient.position",
+    )
+
+
+class RecipeIngredient(Base):
+    """One parsed line of Recipe.ingredients, queryable in SQL"""
+    __tablename__ = "recipe_ingredients"
+    __table_args__ = (
+        Index("ix_recipe_ingredients_key_recipe", "normalized_key", "recipe_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False, default=0)  # order in the original list
+    name = Column(String(300), nullable=False)
+    quantity = Column(Float, nullable=True)
+    unit = Column(String(50), nullable=True)
+    normalized_key = Column(String(300), nullable=False)  # see recipe_matcher.normalize_ingredient_name
+    recipe = relationship("Recipe", back_populates="ingredient_items")
+    tokens = relationship(
+        "RecipeIngredientToken",
+        back_populates="ingredient",
+        cascade="all, delete-orphan",
+    )
+
+
+class RecipeIngredientToken(Base):
+    """One word of a RecipeIngredient's normalized key, for index-backed equality lookups"""
+    __tablename__ = "recipe_ingredient_tokens"
+    __table_args__ = (
+        Index("ix_recipe_ingredient_tokens_token_ingredient", "token", "ingredient_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ingredient_id = Column(
+        Integer, ForeignKey("recipe_ingredients.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token = Column(String(100), nullable=False)
+    ingredient = relationship("RecipeIngredient", back_populates="tokens")
 
 
 class AISuggestion(Base):
@@ -81,21 +129,38 @@ class AISuggestion(Base):
     text = Column(Text, nullable=False)
     dietary = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Recipe generation cache (see app.services.recipe_cache)
+    cache_key = Column(String(64), nullable=True, index=True)  # sha256 of normalized inputs
+    language = Column(String(10), nullable=True)
+    ingredients = Column(Text, nullable=True)  # JSON list, normalized
+    model = Column(String(100), nullable=True)
+    hit_count = Column(Integer, default=0)
+    last_used_at = Column(DateTime, nullable=True, default=datetime.utcnow)
 
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # Newest-first listing per language (keyset on published_at, id)
+        Index("ix_news_language_published_id", "language", "published_at", "id"),
+        # ETag / Last-Modified: newest change per language
+        Index("ix_news_language_updated", "language", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), nullable=False)
     excerpt = Column(String(1000), nullable=True)
     content = Column(Text, nullable=False)
+    # Sanitized HTML rendered from content at write time (app.services.markdown_render)
+    content_html = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
     category = Column(String(100), nullable=True)
     source = Column(String(200), nullable=True)
     image_url = Column(String(500), nullable=True)
     language = Column(String(10), default="de", nullable=False)
     published_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
 class Page(Base):
@@ -109,8 +174,29 @@ class Page(Base):
     slug = Column(String(100), nullable=False)
     title = Column(String(300), nullable=False)
     content = Column(Text, nullable=False)
+    # Sanitized HTML rendered from content at write time (app.services.markdown_render)
+    content_html = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)
     language = Column(String(10), default="de", nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class EmailOutbox(Base):
+    """Outgoing email, delivered by the background sender in app.email_outbox"""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    body_text = Column(Text, nullable=False)
+    body_html = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending | sending | sent | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # lease expiry while sending
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
@@ -0,0 +1,44 @@
+"""Opaque cursors for keyset pagination."""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException
+
+_DATETIME_PREFIX = "dt:"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _DATETIME_PREFIX + value.isoformat()
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(_DATETIME_PREFIX):
+        return datetime.fromisoformat(value[len(_DATETIME_PREFIX):])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page (e.g. (created_at, id))"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("unexpected cursor shape")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -14,8 +14,9 @@ from typing import List, Optional
 
 from ..database import get_db
 from ..models import User
-from ..auth import get_current_user_from_token
-from ..mailcow_api import MailcowAPI
+from ..auth import get_current_user_from_token, invalidate_cached_user
+from ..mailcow_api import AsyncMailcowAPI, get_async_mailcow_client
+from ..services.mailbox_inventory import mailbox_inventory
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/api/admin/mailboxes", tags=["admin-mailbox"])
@@ -55,9 +56,9 @@ def check_admin(current_user: User = Depends(get_current_user_from_token)):
     return current_user
 
 
-def get_mailcow_client() -> MailcowAPI:
-    """Get Mailcow API client"""
-    return MailcowAPI()
+def get_mailcow_client() -> AsyncMailcowAPI:
+    """Get Mailcow API client (shared, pooled)"""
+    return get_async_mailcow_client()
 
 
 # ============ ADMIN ENDPOINTS ============
@@ -69,17 +70,15 @@ async def list_all_mailboxes(
     db: Session = Depends(get_db),
 ):
     """List all mailboxes (admin only)"""
-    mailcow = get_mailcow_client()
-
-    mailboxes = mailcow.get_all_mailboxes()
-    if mailboxes is None:
+    snapshot = await mailbox_inventory.get()
+    if snapshot is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch mailboxes from Mailcow"
         )
 
     result = []
-    for mb in mailboxes:
+    for mb in snapshot.mailboxes:
         email = mb.get("username", "")
         username = email.split("@")[0] if "@" in email else email
 
@@ -106,26 +105,14 @@ async def get_mailbox_statistics(
     db: Session = Depends(get_db),
 ):
     """Get overall mailbox statistics"""
-    mailcow = get_mailcow_client()
-
-    mailboxes = mailcow.get_all_mailboxes()
-    if mailboxes is None:
+    snapshot = await mailbox_inventory.get()
+    if snapshot is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch mailboxes from Mailcow"
         )
 
-    total_mailboxes = len(mailboxes)
-    active_mailboxes = sum(1 for mb in mailboxes if mb.get("active", 0) == 1)
-    total_quota_mb = sum(int(mb.get("quota", 0) / (1024 * 1024)) for mb in mailboxes)
-    total_used_mb = sum(int(mb.get("bytes", 0) / (1024 * 1024)) for mb in mailboxes)
-
-    return AdminMailboxStats(
-        total_mailboxes=total_mailboxes,
-        active_mailboxes=active_mailboxes,
-        total_quota_mb=total_quota_mb,
-        total_used_mb=total_used_mb,
-    )
+    return AdminMailboxStats(**snapshot.stats)
 
 
 @router.post("/{username}/disable")
@@ -137,13 +124,15 @@ async def disable_mailbox_admin(
     """Disable a mailbox (admin only)"""
     mailcow = get_mailcow_client()
 
-    success = mailcow.disable_mailbox(username)
+    success = await mailcow.disable_mailbox(username)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to disable mailbox"
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user = db.query(User).filter(
         User.email.like(f"{username}@%")
@@ -151,6 +140,7 @@ async def disable_mailbox_admin(
     if user:
         user.mailbox_active = False
         db.commit()
+        invalidate_cached_user(user_id=user.id)
 
     return {"message": f"Mailbox {username} disabled"}
 
@@ -164,13 +154,15 @@ async def enable_mailbox_admin(
     """Enable a mailbox (admin only)"""
     mailcow = get_mailcow_client()
 
-    success = mailcow.enable_mailbox(username)
+    success = await mailcow.enable_mailbox(username)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to enable mailbox"
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user = db.query(User).filter(
         User.email.like(f"{username}@%")
@@ -178,6 +170,7 @@ async def enable_mailbox_admin(
     if user:
         user.mailbox_active = True
         db.commit()
+        invalidate_cached_user(user_id=user.id)
 
     return {"message": f"Mailbox {username} enabled"}
 
@@ -192,13 +185,15 @@ async def set_mailbox_quota_admin(
     """Set mailbox quota (admin only)"""
     mailcow = get_mailcow_client()
 
-    success = mailcow.set_mailbox_quota(username, quota_mb)
+    success = await mailcow.set_mailbox_quota(username, quota_mb)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to set quota"
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user = db.query(User).filter(
         User.email.like(f"{username}@%")
@@ -206,6 +201,7 @@ async def set_mailbox_quota_admin(
     if user:
         user.mailbox_quota_mb = quota_mb
         db.commit()
+        invalidate_cached_user(user_id=user.id)
 
     return {"message": f"Quota for {username} set to {quota_mb}MB"}
 
@@ -219,8 +215,12 @@ async def get_mailbox_admin(
     """Get detailed mailbox information (admin only)"""
     mailcow = get_mailcow_client()
 
-    # Get details
-    details = mailcow.get_mailbox_details(username)
+    # Get details from the inventory snapshot, falling back to Mailcow for
+    # mailboxes created since the last refresh
+    snapshot = await mailbox_inventory.get()
+    details = snapshot.by_username.get(username) if snapshot else None
+    if details is None:
+        details = await mailcow.get_mailbox_details(username)
     if not details:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -228,7 +228,7 @@ async def get_mailbox_admin(
         )
 
     # Get forwarding rules
-    forwarding = mailcow.get_forwarding_rules(username)
+    forwarding = await mailcow.get_forwarding_rules(username)
 
     quota_total = details.get("quota", 1)
     quota_used = details.get("bytes", 0)
@@ -257,13 +257,15 @@ async def delete_mailbox_admin(
     """Delete mailbox (admin only)"""
     mailcow = get_mailcow_client()
 
-    success = mailcow.delete_mailbox(username)
+    success = await mailcow.delete_mailbox(username)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete mailbox"
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user = db.query(User).filter(
         User.email.like(f"{username}@%")
@@ -272,5 +274,6 @@ async def delete_mailbox_admin(
         user.mailbox_enabled = False
         user.mailbox_active = False
         db.commit()
+        invalidate_cached_user(user_id=user.id)
 
     return {"message": f"Mailbox {username} deleted"}
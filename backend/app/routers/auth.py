@@ -1,20 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from pydantic import BaseModel
 from typing import Optional
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User
 from ..schemas import UserCreate, User as UserSchema
 from ..auth import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
-    get_current_user_from_token,
+    get_current_user_async,
+    invalidate_cached_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from ..email_verification import generate_verification_token, send_verification_email
+from ..email_outbox import outbox_sender
+from ..email_verification import generate_verification_token, queue_verification_email
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -38,30 +41,38 @@ class VerifyEmailRequest(BaseModel):
 
 
 @router.post("/register", response_model=RegistrationResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, language: str = "de", db: AsyncSession = Depends(get_async_db)):
     """Register a new user - sends verification email"""
     # Check if username already exists
-    db_user = db.query(User).filter(User.username == user.username).first()
+    result = await db.execute(select(User.id).where(User.username == user.username))
+    db_user = result.first()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
+    # A verification mail is required to activate the account
+    if not user.email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email is required"
+        )
+
     # Check if email already exists
-    if user.email:
-        db_email = db.query(User).filter(User.email == user.email).first()
-        if db_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+    result = await db.execute(select(User.id).where(User.email == user.email))
+    db_email = result.first()
+    if db_email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Generate verification token
     verification_token = generate_verification_token()
     
     # Create new user (not verified yet)
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -70,20 +81,10 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         is_email_verified=False
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    # Send verification email
-    email_sent = send_verification_email(user.email, user.username, verification_token)
-    
-    if not email_sent:
-        # Delete user if email sending failed
-        db.delete(db_user)
-        db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send verification email. Please try again."
-        )
+    # Queued in the same transaction; the outbox sender delivers it
+    db.add(queue_verification_email(user.email, user.username, verification_token, language))
+    await db.commit()
+    outbox_sender.notify()
     
     return {
         "message": "Registration successful! Please check your email to verify your account.",
@@ -92,11 +93,12 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/verify-email", response_model=Token)
-async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db)):
+async def verify_email(request: VerifyEmailRequest, db: AsyncSession = Depends(get_async_db)):
     """Verify email with token and return access token"""
-    db_user = db.query(User).filter(
-        User.email_verification_token == request.token
-    ).first()
+    result = await db.execute(
+        select(User).where(User.email_verification_token == request.token)
+    )
+    db_user = result.scalars().first()
     
     if not db_user:
         raise HTTPException(
@@ -107,8 +109,8 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
     # Mark email as verified
     db_user.is_email_verified = True
     db_user.email_verification_token = None
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    invalidate_cached_user(user_id=db_user.id)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -121,11 +123,12 @@ async def verify_email(request: VerifyEmailRequest, db: Session = Depends(get_db
 
 
 @router.post("/login", response_model=Token)
-async def login(user: UserCreate, db: Session = Depends(get_db)):
+async def login(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Login user and return JWT token"""
     # Find user by username
-    db_user = db.query(User).filter(User.username == user.username).first()
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    result = await db.execute(select(User).where(User.username == user.username))
+    db_user = result.scalars().first()
+    if not db_user or not await verify_password_async(user.password, db_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -147,18 +150,9 @@ async def login(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
-    
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": db_user.username},
-        expires_delta=access_token_expires
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserSchema)
-async def get_current_user(current_user: User = Depends(get_current_user_from_token)):
+async def get_current_user(current_user: User = Depends(get_current_user_async)):
     """Get current user info from token"""
     return current_user
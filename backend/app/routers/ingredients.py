@@ -1,22 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app import schemas, models
-from app.database import get_db
-from app.auth import get_current_user_from_token
+from app.database import get_async_db
+from app.auth import get_current_user_async
 
 router = APIRouter(prefix="/api/ingredients", tags=["ingredients"])
 
 
+async def _get_owned_ingredient(db: AsyncSession, ingredient_id: int, user_id: int) -> Optional[models.Ingredient]:
+    result = await db.execute(
+        select(models.Ingredient).where(models.Ingredient.id == ingredient_id, models.Ingredient.user_id == user_id)
+    )
+    return result.scalars().first()
+
+
 @router.get("/", response_model=List[schemas.Ingredient])
-def list_ingredients(skip: int = 0, limit: int = 100, current_user: models.User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def list_ingredients(skip: int = 0, limit: int = 100, current_user: models.User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """List only the current user's ingredients"""
-    return db.query(models.Ingredient).filter(models.Ingredient.user_id == current_user.id).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(models.Ingredient).where(models.Ingredient.user_id == current_user.id).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.post("/", response_model=schemas.Ingredient)
-def create_ingredient(item: schemas.IngredientCreate, current_user: models.User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def create_ingredient(item: schemas.IngredientCreate, current_user: models.User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Create ingredient for current user"""
     db_item = models.Ingredient(
         user_id=current_user.id,
@@ -29,27 +40,27 @@ def create_ingredient(item: schemas.IngredientCreate, current_user: models.User
         notes=item.notes
     )
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 
 @router.get("/{ingredient_id}", response_model=schemas.Ingredient)
-def get_ingredient(ingredient_id: int, current_user: models.User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def get_ingredient(ingredient_id: int, current_user: models.User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Get ingredient - only if it belongs to current user"""
-    item = db.query(models.Ingredient).filter(models.Ingredient.id == ingredient_id, models.Ingredient.user_id == current_user.id).first()
+    item = await _get_owned_ingredient(db, ingredient_id, current_user.id)
     if not item:
         raise HTTPException(status_code=404, detail="Not found")
     return item
 
 
 @router.put("/{ingredient_id}", response_model=schemas.Ingredient)
-def update_ingredient(ingredient_id: int, item: schemas.IngredientCreate, current_user: models.User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def update_ingredient(ingredient_id: int, item: schemas.IngredientCreate, current_user: models.User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Update ingredient - only if it belongs to current user"""
-    db_item = db.query(models.Ingredient).filter(models.Ingredient.id == ingredient_id, models.Ingredient.user_id == current_user.id).first()
+    db_item = await _get_owned_ingredient(db, ingredient_id, current_user.id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Ingredient not found")
-    
+
     # Update fields
     db_item.name = item.name
     db_item.category = item.category
@@ -58,18 +69,18 @@ def update_ingredient(ingredient_id: int, item: schemas.IngredientCreate, curren
     db_item.unit = item.unit
     db_item.expiry_date = item.expiry_date
     db_item.notes = item.notes
-    
-    db.commit()
-    db.refresh(db_item)
+
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 
 @router.delete("/{ingredient_id}")
-def delete_ingredient(ingredient_id: int, current_user: models.User = Depends(get_current_user_from_token), db: Session = Depends(get_db)):
+async def delete_ingredient(ingredient_id: int, current_user: models.User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     """Delete ingredient - only if it belongs to current user"""
-    item = db.query(models.Ingredient).filter(models.Ingredient.id == ingredient_id, models.Ingredient.user_id == current_user.id).first()
+    item = await _get_owned_ingredient(db, ingredient_id, current_user.id)
     if not item:
         raise HTTPException(status_code=404, detail="Ingredient not found")
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     return {"ok": True}
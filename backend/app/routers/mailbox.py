@@ -9,15 +9,16 @@ Handles user mailbox operations:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User
-from ..auth import get_current_user_from_token
-from ..mailcow_api import MailcowAPI
+from ..auth import get_current_user_async, invalidate_cached_user
+from ..mailcow_api import AsyncMailcowAPI, get_async_mailcow_client
+from ..services.mailbox_inventory import mailbox_inventory
 
 router = APIRouter(prefix="/api/mailbox", tags=["mailbox"])
 
@@ -61,9 +62,9 @@ class ForwardingRule(BaseModel):
 # ============ HELPER FUNCTIONS ============
 
 
-def get_mailcow_client() -> MailcowAPI:
-    """Get Mailcow API client instance"""
-    return MailcowAPI()
+def get_mailcow_client() -> AsyncMailcowAPI:
+    """Get Mailcow API client instance (shared, pooled)"""
+    return get_async_mailcow_client()
 
 
 def get_mailbox_username(user: User) -> str:
@@ -82,11 +83,11 @@ def get_mailbox_username(user: User) -> str:
 
 @router.get("", response_model=MailboxStatus)
 async def get_mailbox_status(
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get current user's mailbox status"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,7 +98,7 @@ async def get_mailbox_status(
     mailcow = get_mailcow_client()
 
     # Get mailbox details from Mailcow
-    details = mailcow.get_mailbox_details(mailbox_username)
+    details = await mailcow.get_mailbox_details(mailbox_username)
 
     if not details:
         # Mailbox doesn't exist in Mailcow
@@ -130,11 +131,11 @@ async def get_mailbox_status(
 @router.post("", status_code=201)
 async def create_mailbox(
     request: CreateMailboxRequest,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create mailbox for current user"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,7 +153,7 @@ async def create_mailbox(
     mailcow = get_mailcow_client()
 
     # Create mailbox in Mailcow
-    success = mailcow.create_mailbox(
+    success = await mailcow.create_mailbox(
         username=mailbox_username,
         password=request.password,
         display_name=user.username,
@@ -165,11 +166,14 @@ async def create_mailbox(
             detail="Failed to create mailbox. Check API logs for details."
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user.mailbox_enabled = True
     user.mailbox_active = True
     user.mailbox_created_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    invalidate_cached_user(user_id=user.id)
 
     return {
         "message": "Mailbox created successfully",
@@ -179,11 +183,11 @@ async def create_mailbox(
 
 @router.delete("", status_code=200)
 async def delete_mailbox(
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete mailbox for current user"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -200,7 +204,7 @@ async def delete_mailbox(
     mailcow = get_mailcow_client()
 
     # Delete mailbox from Mailcow
-    success = mailcow.delete_mailbox(mailbox_username)
+    success = await mailcow.delete_mailbox(mailbox_username)
 
     if not success:
         raise HTTPException(
@@ -208,21 +212,24 @@ async def delete_mailbox(
             detail="Failed to delete mailbox"
         )
 
+    mailbox_inventory.invalidate()
+
     # Update user record
     user.mailbox_enabled = False
     user.mailbox_active = False
-    db.commit()
+    await db.commit()
+    invalidate_cached_user(user_id=user.id)
 
     return {"message": "Mailbox deleted successfully"}
 
 
 @router.get("/quota", response_model=MailboxQuota)
 async def get_mailbox_quota(
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get mailbox quota and usage"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -238,7 +245,7 @@ async def get_mailbox_quota(
     mailbox_username = get_mailbox_username(user)
     mailcow = get_mailcow_client()
 
-    quota = mailcow.get_mailbox_quota(mailbox_username)
+    quota = await mailcow.get_mailbox_quota(mailbox_username)
 
     if not quota:
         raise HTTPException(
@@ -256,11 +263,11 @@ async def get_mailbox_quota(
 @router.post("/password")
 async def change_mailbox_password(
     request: MailboxPassword,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Change mailbox password"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -276,7 +283,7 @@ async def change_mailbox_password(
     mailbox_username = get_mailbox_username(user)
     mailcow = get_mailcow_client()
 
-    success = mailcow.set_mailbox_password(mailbox_username, request.new_password)
+    success = await mailcow.set_mailbox_password(mailbox_username, request.new_password)
 
     if not success:
         raise HTTPException(
@@ -290,11 +297,11 @@ async def change_mailbox_password(
 @router.post("/forwarding")
 async def add_forwarding_rule(
     request: ForwardingRule,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add email forwarding rule"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -310,7 +317,7 @@ async def add_forwarding_rule(
     mailbox_username = get_mailbox_username(user)
     mailcow = get_mailcow_client()
 
-    success = mailcow.add_forwarding(
+    success = await mailcow.add_forwarding(
         username=mailbox_username,
         forward_to=request.destination,
         keep_local=request.keep_local_copy,
@@ -331,11 +338,11 @@ async def add_forwarding_rule(
 @router.delete("/forwarding/{destination}")
 async def remove_forwarding_rule(
     destination: str,
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Remove email forwarding rule"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -351,7 +358,7 @@ async def remove_forwarding_rule(
     mailbox_username = get_mailbox_username(user)
     mailcow = get_mailcow_client()
 
-    success = mailcow.remove_forwarding(mailbox_username, destination)
+    success = await mailcow.remove_forwarding(mailbox_username, destination)
 
     if not success:
         raise HTTPException(
@@ -364,11 +371,11 @@ async def remove_forwarding_rule(
 
 @router.get("/forwarding")
 async def get_forwarding_rules(
-    current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all forwarding rules for user's mailbox"""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -384,7 +391,7 @@ async def get_forwarding_rules(
     mailbox_username = get_mailbox_username(user)
     mailcow = get_mailcow_client()
 
-    rules = mailcow.get_forwarding_rules(mailbox_username)
+    rules = await mailcow.get_forwarding_rules(mailbox_username)
 
     if rules is None:
         raise HTTPException(
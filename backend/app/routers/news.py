@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.http_cache import cache_headers, is_not_modified, make_etag, not_modified_response
 from app.models import News
+from app.pagination import decode_cursor, encode_cursor
 from app.schemas_news import NewsCreate, NewsUpdate, NewsResponse
+from app.services.markdown_render import apply_rendered_content, content_hash, render_markdown
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(tags=["news"])
 
@@ -83,35 +87,79 @@ FOOD_NEWS_SAMPLES = {
 }
 
 
+# Samples are static, so they get a fixed timestamp (stable ETags) and are
+# converted (and their Markdown rendered) once instead of on every request.
+SAMPLE_PUBLISHED_AT = datetime(2024, 1, 1)
+SAMPLE_NEWS_RESPONSES = {
+    language: [
+        {
+            "id": idx + 1,
+            "title": article["title"],
+            "excerpt": article["excerpt"],
+            "content": article["content"],
+            "content_html": render_markdown(article["content"]),
+            "content_hash": content_hash(article["content"]),
+            "category": article["category"],
+            "source": article["source"],
+            "published_at": SAMPLE_PUBLISHED_AT,
+            "image_url": None,
+            "language": language
+        }
+        for idx, article in enumerate(articles)
+    ]
+    for language, articles in FOOD_NEWS_SAMPLES.items()
+}
+
+
 @router.get("/", response_model=List[NewsResponse])
 def get_news(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(6, ge=1, le=50),
-    language: str = Query("de")
+    language: str = Query("de"),
+    cursor: Optional[str] = None,
 ):
-    """Get news articles with pagination"""
-    # First try to get from database
-    articles = db.query(News).offset(skip).limit(limit).all()
-    
-    # If no articles in database, return sample data
-    if not articles:
-        sample_articles = FOOD_NEWS_SAMPLES.get(language, FOOD_NEWS_SAMPLES.get("de", []))
-        return [
-            {
-                "id": idx + 1,
-                "title": article["title"],
-                "excerpt": article["excerpt"],
-                "content": article["content"],
-                "category": article["category"],
-                "source": article["source"],
-                "published_at": datetime.utcnow().isoformat(),
-                "image_url": None,
-                "language": language
-            }
-            for idx, article in enumerate(sample_articles)
-        ]
-    
+    """
+    Get news articles for a language, newest first.
+
+    Pass the `X-Next-Cursor` response header back as `cursor` for keyset
+    pagination (`skip` still works but gets slower on deep pages). Responses
+    carry ETag/Last-Modified derived from the newest change, so clients can
+    revalidate with If-None-Match / If-Modified-Since and get a 304.
+    """
+    newest, count = db.query(func.max(News.updated_at), func.count(News.id)).filter(
+        News.language == language
+    ).one()
+
+    if not count:
+        # No articles for this language yet: serve the sample articles
+        samples = SAMPLE_NEWS_RESPONSES.get(language, SAMPLE_NEWS_RESPONSES["de"])
+        page = samples[skip:skip + limit] if not cursor else []
+        headers = cache_headers(make_etag("samples", language, skip, limit, cursor), SAMPLE_PUBLISHED_AT)
+        if is_not_modified(request, headers["ETag"], SAMPLE_PUBLISHED_AT):
+            return not_modified_response(headers)
+        response.headers.update(headers)
+        return page
+
+    headers = cache_headers(make_etag(language, newest, count, skip, limit, cursor), newest)
+    if is_not_modified(request, headers["ETag"], newest):
+        return not_modified_response(headers)
+
+    query = db.query(News).filter(News.language == language).order_by(News.published_at.desc(), News.id.desc())
+    if cursor:
+        published_at, last_id = decode_cursor(cursor, 2)
+        query = query.filter(tuple_(News.published_at, News.id) < tuple_(published_at, last_id))
+    else:
+        query = query.offset(skip)
+
+    articles = query.limit(limit + 1).all()
+    if len(articles) > limit:
+        articles = articles[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor((articles[-1].published_at, articles[-1].id))
+
+    response.headers.update(headers)
     return articles
 
 
@@ -121,20 +169,9 @@ def get_news_article(article_id: int, db: Session = Depends(get_db)):
     article = db.query(News).filter(News.id == article_id).first()
     if not article:
         # Return sample article if not found in database
-        sample_articles = FOOD_NEWS_SAMPLES.get("de", [])
-        if article_id - 1 < len(sample_articles):
-            sample = sample_articles[article_id - 1]
-            return {
-                "id": article_id,
-                "title": sample["title"],
-                "excerpt": sample["excerpt"],
-                "content": sample["content"],
-                "category": sample["category"],
-                "source": sample["source"],
-                "published_at": datetime.utcnow().isoformat(),
-                "image_url": None,
-                "language": "de"
-            }
+        sample_articles = SAMPLE_NEWS_RESPONSES["de"]
+        if 0 < article_id <= len(sample_articles):
+            return sample_articles[article_id - 1]
         raise HTTPException(status_code=404, detail="Article not found")
     return article
 
@@ -152,6 +189,7 @@ def create_news(article: NewsCreate, db: Session = Depends(get_db)):
         language=article.language,
         published_at=datetime.utcnow()
     )
+    apply_rendered_content(db_article)
     db.add(db_article)
     db.commit()
     db.refresh(db_article)
@@ -171,6 +209,7 @@ def update_news(article_id: int, article: NewsUpdate, db: Session = Depends(get_
         db_article.excerpt = article.excerpt
     if article.content:
         db_article.content = article.content
+        apply_rendered_content(db_article)
     if article.category:
         db_article.category = article.category
     if article.source:
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.http_cache import cache_headers, is_not_modified, not_modified_response
 from app.models import Page, User
 from app.schemas import PageResponse, PageCreate, PageUpdate
 from app.auth import get_current_user_from_token
+from app.services.markdown_render import apply_rendered_content
+from app.services.page_cache import invalidate_page, page_cache, render_page
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -1062,28 +1068,28 @@ Föör Fraagen, Bedenken oder Anfragen to disse Datenschutzerkläring kannst du
 }
 
 # Get or create pages
-@router.get("/pages/public/{slug}")
-def get_public_page(slug: str, language: str = Query("de"), db: Session = Depends(get_db)):
-    """Get a public page by slug and language"""
-    print(f"🔍 get_public_page called: slug={slug}, language={language}")
-    # Get from database first - prioritize real data
-    page = db.query(Page).filter(Page.slug == slug, Page.language == language).first()
-    
-    if page:
-        print(f"✅ Found page: {page.language} - {page.title}")
-        return PageResponse(
-            id=page.id,
-            slug=page.slug,
-            title=page.title,
-            content=page.content,
-            language=page.language,
-            page_key=page.page_key,
-            updated_at=page.updated_at
-        )
-    
-    print(f"❌ Page not found for slug={slug}, language={language}")
-    # If not found, return 404 (don't fallback to hardcoded)
-    raise HTTPException(status_code=404, detail="Page not found")
+@router.get("/pages/public/{slug}", response_model=PageResponse)
+def get_public_page(request: Request, slug: str, language: str = Query("de"), db: Session = Depends(get_db)):
+    """Get a public page by slug and language (served from the page cache)"""
+    rendered = page_cache.get((slug, language))
+    if rendered is None:
+        page = db.query(Page).filter(Page.slug == slug, Page.language == language).first()
+        if not page:
+            # If not found, return 404 (don't fallback to hardcoded)
+            logger.debug(f"Page not found for slug={slug}, language={language}")
+            raise HTTPException(status_code=404, detail="Page not found")
+        rendered = render_page(page)
+        page_cache.set((slug, language), rendered)
+
+    headers = cache_headers(rendered.etag, rendered.last_modified)
+    headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(request, rendered.etag, rendered.last_modified):
+        return not_modified_response(headers)
+
+    body, encoding = rendered.encoded(request.headers.get("accept-encoding", ""))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/pages")
@@ -1094,15 +1100,7 @@ def get_all_pages(current_user: User = Depends(get_current_user_from_token), db:
     
     pages = db.query(Page).all()
     return [
-        PageResponse(
-            id=page.id,
-            slug=page.slug,
-            title=page.title,
-            content=page.content,
-            language=page.language,
-            page_key=page.page_key,
-            updated_at=page.updated_at
-        )
+        PageResponse.from_orm(page)
         for page in pages
     ]
 
@@ -1117,15 +1115,7 @@ def get_page(page_id: int, current_user: User = Depends(get_current_user_from_to
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
     
-    return PageResponse(
-        id=page.id,
-        slug=page.slug,
-        title=page.title,
-        content=page.content,
-        language=page.language,
-        page_key=page.page_key,
-        updated_at=page.updated_at
-    )
+    return PageResponse.from_orm(page)
 
 
 @router.post("/pages")
@@ -1141,18 +1131,12 @@ def create_page(page: PageCreate, current_user: User = Depends(get_current_user_
         language=page.language,
         page_key=page.page_key
     )
+    apply_rendered_content(new_page)
     db.add(new_page)
     db.commit()
     db.refresh(new_page)
-    return PageResponse(
-        id=new_page.id,
-        slug=new_page.slug,
-        title=new_page.title,
-        content=new_page.content,
-        language=new_page.language,
-        page_key=new_page.page_key,
-        updated_at=new_page.updated_at
-    )
+    invalidate_page(new_page.slug, new_page.language)
+    return PageResponse.from_orm(new_page)
 
 
 @router.put("/pages/{page_id}")
@@ -1165,26 +1149,22 @@ def update_page(page_id: int, page: PageUpdate, current_user: User = Depends(get
     if not db_page:
         raise HTTPException(status_code=404, detail="Page not found")
     
+    old_slug, old_language = db_page.slug, db_page.language
     if page.slug:
         db_page.slug = page.slug
     if page.title:
         db_page.title = page.title
     if page.content:
         db_page.content = page.content
+        apply_rendered_content(db_page)
     if page.language:
         db_page.language = page.language
     
     db.commit()
     db.refresh(db_page)
-    return PageResponse(
-        id=db_page.id,
-        slug=db_page.slug,
-        title=db_page.title,
-        content=db_page.content,
-        language=db_page.language,
-        page_key=db_page.page_key,
-        updated_at=db_page.updated_at
-    )
+    invalidate_page(old_slug, old_language)
+    invalidate_page(db_page.slug, db_page.language)
+    return PageResponse.from_orm(db_page)
 
 
 @router.delete("/pages/{page_id}")
@@ -1199,4 +1179,5 @@ def delete_page(page_id: int, current_user: User = Depends(get_current_user_from
     
     db.delete(db_page)
     db.commit()
+    invalidate_page(db_page.slug, db_page.language)
     return {"message": "Page deleted successfully"}
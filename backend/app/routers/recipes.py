@@ -1,23 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import json
 
+from app.auth import get_optional_user_from_token
 from app.database import get_db
-from app.models import Recipe, AISuggestion
-from app.schemas import Recipe as RecipeSchema, RecipeCreate, AISuggestion as AISuggestionSchema, SaveAIRecipeRequest
-from app.services.ai_gemini import generate_recipe, save_ai_suggestion
+from app.models import Recipe, AISuggestion, Ingredient, User
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas import Recipe as RecipeSchema, RecipeListItem, RecipeCreate, AISuggestion as AISuggestionSchema, SaveAIRecipeRequest
+from app.services.ai_gemini import save_ai_suggestion
+from app.services.recipe_cache import generate_recipe_cached, stream_recipe_cached
+from app.services.recipe_jobs import recipe_jobs, run_generation_job, JobQueueFullError
+from app.services.recipe_ingredients import ingredient_key_clause, sync_recipe_ingredients
+from app.services.recipe_matcher import recipe_matcher, recipe_to_markdown, RECIPE_MATCH_MIN_COVERAGE
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[RecipeSchema])
-def get_recipes(db: Session = Depends(get_db), healthy_only: bool = False, language: str = "de"):
-    """Get all recipes for a specific language"""
-    query = db.query(Recipe).filter(Recipe.language == language)
+RECIPE_LIST_FIELDS = tuple(RecipeListItem.__fields__)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated `fields` projection (id is always included)"""
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in RECIPE_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in RECIPE_LIST_FIELDS if f in requested and f != "id"]
+
+
+@router.get("/", response_model=List[RecipeListItem], response_model_exclude_unset=True)
+def get_recipes(
+    response: Response,
+    db: Session = Depends(get_db),
+    healthy_only: bool = False,
+    language: str = "de",
+    ingredient: Optional[List[str]] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Get recipes for a specific language, newest first.
+
+    Results are paginated by keyset on (created_at, id): when more recipes
+    exist, the `X-Next-Cursor` response header holds the `cursor` for the
+    next page. `fields` (comma-separated, e.g. "name,description") limits
+    the returned columns so list views need not ship instructions.
+
+    Repeat `ingredient` to only return recipes containing all of the given
+    ingredients (matched against the normalized recipe_ingredients table).
+    """
+    columns = _parse_fields(fields)
+    selected = [getattr(Recipe, name) for name in columns] if columns else [Recipe]
+    # The sort key is always needed to build the next cursor
+    query = db.query(*selected, Recipe.created_at.label("_cursor_created_at"), Recipe.id.label("_cursor_id"))
+
+    query = query.filter(Recipe.language == language)
     if healthy_only:
         query = query.filter(Recipe.is_healthy == True)
-    return query.all()
+    for name in ingredient or []:
+        clause = ingredient_key_clause(name)
+        if clause is not None:
+            query = query.filter(Recipe.ingredient_items.any(clause))
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, 2)
+        query = query.filter(tuple_(Recipe.created_at, Recipe.id) < tuple_(created_at, last_id))
+
+    rows = query.order_by(Recipe.created_at.desc(), Recipe.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor((rows[-1]._cursor_created_at, rows[-1]._cursor_id))
+
+    if columns:
+        return [{name: getattr(row, name) for name in columns} for row in rows]
+    return [row[0] for row in rows]
 
 
 @router.get("/{recipe_id}", response_model=RecipeSchema)
@@ -33,9 +94,11 @@ def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
 def create_recipe(recipe: RecipeCreate, db: Session = Depends(get_db)):
     """Create a new recipe"""
     db_recipe = Recipe(**recipe.dict())
+    sync_recipe_ingredients(db_recipe)
     db.add(db_recipe)
     db.commit()
     db.refresh(db_recipe)
+    recipe_matcher.invalidate()
     return db_recipe
 
 
@@ -47,25 +110,53 @@ def delete_recipe(recipe_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Recipe not found")
     db.delete(recipe)
     db.commit()
+    recipe_matcher.invalidate()
     return {"status": "deleted"}
 
 
-@router.get("/match/ingredients")
-def generate_recipe_from_ingredients(db: Session = Depends(get_db), language: str = "de"):
-    """Generate a recipe using available ingredients"""
-    from app.models import Ingredient
-    
-    # Get all available ingredients from the database
-    available_ingredients = db.query(Ingredient).all()
-    ingredient_names = [ing.name for ing in available_ingredients]
-    
+def _pantry_names(db: Session, current_user: Optional[User]) -> List[str]:
+    """Ingredient names of the user's pantry (all ingredients for anonymous calls)"""
+    query = db.query(Ingredient.name)
+    if current_user is not None:
+        query = query.filter(Ingredient.user_id == current_user.id)
+    ingredient_names = [name for (name,) in query.all()]
+
     if not ingredient_names:
         # If no ingredients available, return error
         raise HTTPException(status_code=400, detail="Keine Zutaten verfügbar")
+    return ingredient_names
+
+
+@router.get("/match/ingredients")
+def generate_recipe_from_ingredients(
+    db: Session = Depends(get_db),
+    language: str = "de",
+    use_ai: bool = False,
+    current_user: Optional[User] = Depends(get_optional_user_from_token),
+):
+    """
+    Suggest a recipe for the available ingredients.
+
+    Stored recipes that the pantry covers well enough are answered from the
+    local match index; otherwise (or with use_ai=true) a recipe is generated.
+    """
+    ingredient_names = _pantry_names(db, current_user)
+
+    matches = recipe_matcher.match(db, ingredient_names, language=language)
+    if matches and matches[0]["coverage"] >= RECIPE_MATCH_MIN_COVERAGE and not use_ai:
+        best = db.query(Recipe).filter(Recipe.id == matches[0]["recipe_id"]).first()
+        if best:
+            return {
+                "text": recipe_to_markdown(best),
+                "model": "recipe-index",
+                "cached": False,
+                "recipe_id": best.id,
+                "matches": matches,
+            }
     
-    # Generate recipe using available ingredients
-    result = generate_recipe(ingredients=ingredient_names, language=language)
-    return result
+    # Generate recipe using available ingredients (served from cache when possible)
+    result = generate_recipe_cached(db, ingredients=ingredient_names, language=language)
+    return {**result, "matches": matches}
 
 
 @router.post("/seed-sample")
@@ -184,19 +275,102 @@ def seed_sample_recipes(db: Session = Depends(get_db)):
         ).first()
         if not existing:
             db_recipe = Recipe(**recipe_data)
+            sync_recipe_ingredients(db_recipe)
             db.add(db_recipe)
     
     db.commit()
+    recipe_matcher.invalidate()
     return {"status": "seeded", "count": len(sample_recipes)}
 
 
 @router.post("/generate")
-def generate_ai_recipe(dietary: str = None, language: str = "de"):
+def generate_ai_recipe(dietary: str = None, language: str = "de", db: Session = Depends(get_db)):
     """Generate a random recipe using AI"""
-    result = generate_recipe(dietary_preferences=dietary, language=language)
+    result = generate_recipe_cached(db, dietary_preferences=dietary, language=language)
     return result
 
 
+def _sse_response(events) -> StreamingResponse:
+    """Wrap recipe stream events as a Server-Sent Events response"""
+    def encode():
+        for event in events:
+            name = event.pop("event")
+            yield f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        encode(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/generate/stream")
+def stream_ai_recipe(dietary: str = None, language: str = "de", db: Session = Depends(get_db)):
+    """Generate a random recipe using AI, streamed as Server-Sent Events"""
+    return _sse_response(stream_recipe_cached(db, dietary_preferences=dietary, language=language))
+
+
+@router.get("/match/ingredients/stream")
+def stream_recipe_from_ingredients(
+    db: Session = Depends(get_db),
+    language: str = "de",
+    current_user: Optional[User] = Depends(get_optional_user_from_token),
+):
+    """Generate a recipe from available ingredients, streamed as Server-Sent Events"""
+    ingredient_names = _pantry_names(db, current_user)
+    return _sse_response(stream_recipe_cached(db, ingredients=ingredient_names, language=language))
+
+
+def _submit_generation_job(kind: str, **kwargs) -> dict:
+    """Queue a generation job, answering 429 when the queue is saturated"""
+    try:
+        job = recipe_jobs.submit(kind, run_generation_job, **kwargs)
+    except JobQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many recipe generations in progress, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/recipes/jobs/{job.id}",
+    }
+
+
+@router.post("/generate/jobs", status_code=status.HTTP_202_ACCEPTED)
+def generate_ai_recipe_job(dietary: str = None, language: str = "de"):
+    """Start AI recipe generation in the background and return a job id"""
+    return _submit_generation_job("generate", dietary_preferences=dietary, language=language)
+
+
+@router.post("/match/ingredients/jobs", status_code=status.HTTP_202_ACCEPTED)
+def generate_recipe_from_ingredients_job(
+    db: Session = Depends(get_db),
+    language: str = "de",
+    current_user: Optional[User] = Depends(get_optional_user_from_token),
+):
+    """Start recipe generation from available ingredients in the background"""
+    ingredient_names = _pantry_names(db, current_user)
+    return _submit_generation_job("match", ingredients=ingredient_names, language=language)
+
+
+@router.get("/jobs/{job_id}")
+async def get_recipe_job(job_id: str, wait: float = Query(0, ge=0, le=30)):
+    """
+    Get a generation job's status and result.
+
+    With `wait` > 0 the request long-polls for up to that many seconds until
+    the job finishes.
+    """
+    job = recipe_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    await recipe_jobs.wait(job, wait)
+    return job.to_dict()
+
+
 @router.post("/save-from-ai")
 def save_ai_recipe(request: SaveAIRecipeRequest, db: Session = Depends(get_db), language: str = "de"):
     """Save an AI-generated recipe"""
@@ -219,8 +393,14 @@ def save_ai_recipe(request: SaveAIRecipeRequest, db: Session = Depends(get_db),
     return recipe
 
 
-@router.get("/ai/suggestions")
+@router.get("/ai/suggestions", response_model=List[AISuggestionSchema])
 def get_ai_suggestions(limit: int = 5, db: Session = Depends(get_db)):
-    """Get recent AI suggestions"""
-    suggestions = db.query(AISuggestion).order_by(AISuggestion.created_at.desc()).limit(limit).all()
+    """Get recent AI suggestions (generation cache entries are private and excluded)"""
+    suggestions = (
+        db.query(AISuggestion)
+        .filter(AISuggestion.cache_key.is_(None))
+        .order_by(AISuggestion.created_at.desc())
+        .limit(limit)
+        .all()
+    )
     return suggestions
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from ..database import get_db
 from ..models import User
-from .auth import get_current_user_from_token
+from ..auth import get_current_user_from_token, invalidate_cached_user
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
@@ -91,6 +91,7 @@ def make_admin(
     user.is_admin = True
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user_id=user.id)
     
     return {
         "id": user.id,
@@ -137,6 +138,7 @@ def remove_admin(
     user.is_admin = False
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(user_id=user.id)
     
     return {
         "id": user.id,
@@ -176,6 +178,7 @@ def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidate_cached_user(user_id=user_id)
     
     return {
         "id": user.id,
@@ -83,6 +83,24 @@ class Recipe(RecipeBase):
         orm_mode = True
 
 
+class RecipeListItem(BaseModel):
+    """Recipe in list responses; only the requested `fields` are set"""
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    ingredients: Optional[str] = None
+    instructions: Optional[str] = None
+    prep_time: Optional[int] = None
+    servings: Optional[int] = None
+    calories: Optional[int] = None
+    is_healthy: Optional[bool] = None
+    language: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
 class AISuggestionBase(BaseModel):
     text: str
     dietary: Optional[str] = None
@@ -139,6 +157,8 @@ class PageUpdate(BaseModel):
 
 class PageResponse(PageBase):
     id: int
+    content_html: Optional[str] = None
+    content_hash: Optional[str] = None
     updated_at: Optional[datetime] = None
 
     class Config:
@@ -28,7 +28,10 @@ class NewsUpdate(BaseModel):
 
 class NewsResponse(NewsBase):
     id: int
+    content_html: Optional[str] = None
+    content_hash: Optional[str] = None
     published_at: datetime
 
     class Config:
+        orm_mode = True
         from_attributes = True
@@ -1,11 +1,25 @@
+import logging
 import os
+import random
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
 import google.generativeai as genai
 
+logger = logging.getLogger(__name__)
+
 # Initialize Gemini AI
 api_key = os.environ.get("GEMINI_API_KEY")
 if api_key:
     genai.configure(api_key=api_key)
 
+# Model discovery / health tracking
+DEFAULT_MODELS = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro']
+GEMINI_MODEL_REFRESH_SECONDS = int(os.getenv("GEMINI_MODEL_REFRESH_SECONDS", "3600"))
+GEMINI_MODEL_COOLDOWN_SECONDS = int(os.getenv("GEMINI_MODEL_COOLDOWN_SECONDS", "300"))
+
 # Sample recipes to return if API fails
 SAMPLE_RECIPES = {
     'de': [
@@ -224,23 +238,136 @@ LANGUAGE_NAMES = {
     'nds': 'Low German'
 }
 
-def generate_recipe(ingredients: list = None, dietary_preferences: str = None, language: str = "de") -> dict:
-    """Generate a recipe using Gemini AI from available ingredients"""
-    try:
-        if not api_key:
-            # Return a fallback recipe if no API key
-            import random
-            recipes_for_lang = SAMPLE_RECIPES.get(language, SAMPLE_RECIPES.get('en', SAMPLE_RECIPES['de']))
-            recipe = random.choice(recipes_for_lang)
-            return recipe
-        
-        # Build the prompt
-        lang_name = LANGUAGE_NAMES.get(language, 'English')
-        
-        if ingredients:
-            # Create a prompt using the available ingredients
-            ingredients_str = ', '.join(ingredients)
-            prompt = f"""Please create a delicious recipe in {lang_name} using these available ingredients: {ingredients_str}.
+def _model_rank(name: str) -> tuple:
+    """Sort key: flash before pro before others, newer versions first, previews last"""
+    family = 0 if 'flash' in name else 1 if 'pro' in name else 2
+    match = re.search(r'gemini-(\d+(?:\.\d+)?)', name)
+    version = float(match.group(1)) if match else 0.0
+    unstable = any(tag in name for tag in ('exp', 'preview'))
+    return (unstable, family, -version, name)
+
+
+class ModelRegistry:
+    """
+    Ranked list of Gemini models that support generateContent.
+
+    Discovery runs once (lazily or in a background thread started at app
+    startup) and is refreshed every GEMINI_MODEL_REFRESH_SECONDS, so recipe
+    generation never waits on genai.list_models(). Models that fail are put
+    on a cooldown (circuit breaker) and tried only after all healthy ones.
+    """
+
+    def __init__(self, refresh_seconds: int = GEMINI_MODEL_REFRESH_SECONDS,
+                 cooldown_seconds: int = GEMINI_MODEL_COOLDOWN_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._models: List[str] = list(DEFAULT_MODELS)
+        self._discovered_at: Optional[float] = None
+        self._discovery_started = False
+        self._cooldown_until: Dict[str, float] = {}
+        self._last_success: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def discover(self) -> List[str]:
+        """Query the Gemini API for usable models (keeps the old list on error)"""
+        try:
+            models = [
+                m.name.replace('models/', '')
+                for m in genai.list_models()
+                if 'generateContent' in m.supported_generation_methods
+            ]
+        except Exception as e:
+            logger.warning(f"Could not list Gemini models: {str(e)}")
+            return self._models
+
+        with self._lock:
+            if models:
+                self._models = sorted(models, key=_model_rank)
+            self._discovered_at = time.time()
+        logger.info(f"Available Gemini models: {self._models}")
+        return self._models
+
+    def candidates(self) -> List[str]:
+        """Models to try, healthiest first"""
+        if not self._discovery_started:
+            self._discovery_started = True
+            self.discover()
+
+        now = time.time()
+        with self._lock:
+            healthy = [m for m in self._models if self._cooldown_until.get(m, 0) <= now]
+            cooling = sorted(
+                (m for m in self._models if self._cooldown_until.get(m, 0) > now),
+                key=lambda m: self._cooldown_until[m],
+            )
+            if self._last_success in healthy:
+                healthy.remove(self._last_success)
+                healthy.insert(0, self._last_success)
+        return healthy + cooling
+
+    def record_success(self, model_name: str) -> None:
+        with self._lock:
+            self._cooldown_until.pop(model_name, None)
+            self._last_success = model_name
+
+    def record_failure(self, model_name: str) -> None:
+        with self._lock:
+            self._cooldown_until[model_name] = time.time() + self.cooldown_seconds
+            if self._last_success == model_name:
+                self._last_success = None
+
+    def _refresh_loop(self) -> None:
+        while True:
+            self.discover()
+            if self._stop.wait(self.refresh_seconds):
+                return
+
+    def start(self) -> None:
+        """Discover models in a background thread and keep them refreshed"""
+        if not api_key or self._thread is not None:
+            return
+        self._discovery_started = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="gemini-model-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def status(self) -> dict:
+        """Snapshot for the metrics endpoint"""
+        now = time.time()
+        with self._lock:
+            return {
+                "models": list(self._models),
+                "discovered_at": self._discovered_at,
+                "last_success": self._last_success,
+                "cooling_down": {
+                    m: round(until - now, 1) for m, until in self._cooldown_until.items() if until > now
+                },
+            }
+
+
+model_registry = ModelRegistry()
+
+
+def fallback_recipe(language: str = "de") -> dict:
+    """Pick a sample recipe for the language (used when the API is unavailable)"""
+    recipes_for_lang = SAMPLE_RECIPES.get(language, SAMPLE_RECIPES.get('en', SAMPLE_RECIPES['de']))
+    return random.choice(recipes_for_lang)
+
+
+def build_recipe_prompt(ingredients: list = None, dietary_preferences: str = None, language: str = "de") -> str:
+    """Build the Gemini prompt for a recipe request"""
+    lang_name = LANGUAGE_NAMES.get(language, 'English')
+    
+    if ingredients:
+        # Create a prompt using the available ingredients
+        ingredients_str = ', '.join(ingredients)
+        prompt = f"""Please create a delicious recipe in {lang_name} using these available ingredients: {ingredients_str}.
 
 Important guidelines:
 - Use ONLY the ingredients provided above
@@ -248,59 +375,115 @@ Important guidelines:
 - Include: ingredients list, detailed cooking instructions, prep time, and servings
 - Make it appealing and well-formatted with markdown headers
 - Include estimated calories if possible"""
-        else:
-            # Generic recipe prompt if no ingredients specified
-            prompt = f"Please create a delicious recipe in {lang_name}. Include: ingredients list, cooking instructions, prep time, and servings. Format it nicely with markdown headers."
-        
-        if dietary_preferences:
-            prompt += f"\nThe recipe should be suitable for a {dietary_preferences} diet."
+    else:
+        # Generic recipe prompt if no ingredients specified
+        prompt = f"Please create a delicious recipe in {lang_name}. Include: ingredients list, cooking instructions, prep time, and servings. Format it nicely with markdown headers."
+    
+    if dietary_preferences:
+        prompt += f"\nThe recipe should be suitable for a {dietary_preferences} diet."
+    
+    return prompt
+
+
+def generate_recipe(ingredients: list = None, dietary_preferences: str = None, language: str = "de") -> dict:
+    """Generate a recipe using Gemini AI from available ingredients"""
+    try:
+        if not api_key:
+            # Return a fallback recipe if no API key
+            return fallback_recipe(language)
         
-        # Get available models dynamically
-        try:
-            available_models = []
-            for m in genai.list_models():
-                if 'generateContent' in m.supported_generation_methods:
-                    available_models.append(m.name.replace('models/', ''))
-            print(f"Available Gemini models: {available_models}")
-        except Exception as e:
-            print(f"Could not list models: {str(e)}")
-            available_models = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro']
+        prompt = build_recipe_prompt(ingredients, dietary_preferences, language)
         
-        # Try to use Gemini API with available models
-        models_to_try = available_models if available_models else ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro']
-        response = None
+        # Try models in order of health/rank (no per-request model listing)
+        response_text = None
         model_used = None
         
-        for model_name in models_to_try:
+        for model_name in model_registry.candidates():
             try:
-                print(f"Trying model: {model_name}")
                 model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt)
+                response_text = model.generate_content(prompt).text
                 model_used = model_name
-                print(f"Successfully used model: {model_name}")
+                model_registry.record_success(model_name)
                 break
             except Exception as e:
-                print(f"Model {model_name} failed: {str(e)}")
+                logger.warning(f"Model {model_name} failed: {str(e)}")
+                model_registry.record_failure(model_name)
                 continue
         
-        if response:
+        if response_text:
             return {
-                "text": response.text,
+                "text": response_text,
                 "model": model_used
             }
         else:
             # Use fallback recipes if API fails
-            import random
-            recipes_for_lang = SAMPLE_RECIPES.get(language, SAMPLE_RECIPES.get('en', SAMPLE_RECIPES['de']))
-            recipe = random.choice(recipes_for_lang)
-            return recipe
+            return fallback_recipe(language)
             
     except Exception as e:
         # Return fallback recipe on any error
-        import random
-        recipes_for_lang = SAMPLE_RECIPES.get(language, SAMPLE_RECIPES.get('en', SAMPLE_RECIPES['de']))
-        recipe = random.choice(recipes_for_lang)
-        return recipe
+        return fallback_recipe(language)
+
+
+def chunk_text(text: str, size: int = 200) -> Iterator[str]:
+    """Split text on line boundaries into chunks of roughly `size` characters"""
+    chunk = ""
+    for line in text.splitlines(keepends=True):
+        chunk += line
+        if len(chunk) >= size:
+            yield chunk
+            chunk = ""
+    if chunk:
+        yield chunk
+
+
+def stream_recipe(ingredients: list = None, dietary_preferences: str = None, language: str = "de") -> Iterator[dict]:
+    """
+    Stream a recipe from Gemini as it is generated.
+
+    Yields event dicts:
+        {"event": "start", "model": name}
+        {"event": "chunk", "text": partial_text}  (repeated)
+        {"event": "done", "model": name, "text": full_text}
+    or, if the model fails after output has started,
+        {"event": "error", "detail": message}
+
+    A model that fails before its first chunk is skipped for the next
+    candidate; if none works, a SAMPLE_RECIPES entry is streamed instead.
+    """
+    if api_key:
+        prompt = build_recipe_prompt(ingredients, dietary_preferences, language)
+
+        for model_name in model_registry.candidates():
+            parts: List[str] = []
+            try:
+                model = genai.GenerativeModel(model_name)
+                for chunk in model.generate_content(prompt, stream=True):
+                    text = chunk.text
+                    if not text:
+                        continue
+                    if not parts:
+                        yield {"event": "start", "model": model_name}
+                    parts.append(text)
+                    yield {"event": "chunk", "text": text}
+            except Exception as e:
+                logger.warning(f"Model {model_name} failed while streaming: {str(e)}")
+                model_registry.record_failure(model_name)
+                if parts:
+                    yield {"event": "error", "detail": "Recipe generation was interrupted"}
+                    return
+                continue
+
+            if parts:
+                model_registry.record_success(model_name)
+                yield {"event": "done", "model": model_name, "text": "".join(parts)}
+                return
+
+    recipe = fallback_recipe(language)
+    yield {"event": "start", "model": recipe["model"]}
+    for text in chunk_text(recipe["text"]):
+        yield {"event": "chunk", "text": text}
+    yield {"event": "done", "model": recipe["model"], "text": recipe["text"]}
+
 
 def save_ai_suggestion(text: str, dietary: str = None) -> dict:
     """Save an AI suggestion to the database (placeholder for future DB integration)"""
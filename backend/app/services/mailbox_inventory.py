@@ -0,0 +1,163 @@
+"""
+Mailbox Inventory Snapshot
+
+Keeps one in-memory copy of Mailcow's `/get/mailbox/all` payload that the
+admin mailbox endpoints read from, instead of each request pulling and
+filtering the full list. The snapshot is refreshed in the background on an
+interval, served stale-while-revalidate, and refreshed by at most one
+request at a time (single flight).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..mailcow_api import MAILCOW_API_KEY, get_async_mailcow_client
+
+logger = logging.getLogger(__name__)
+
+# Snapshot younger than this is served as-is
+MAILBOX_INVENTORY_TTL_SECONDS = float(os.getenv("MAILBOX_INVENTORY_TTL_SECONDS", "60"))
+# Older snapshots are still served (while a refresh runs) up to this age
+MAILBOX_INVENTORY_MAX_STALE_SECONDS = float(os.getenv("MAILBOX_INVENTORY_MAX_STALE_SECONDS", "600"))
+# Background refresh interval
+MAILBOX_INVENTORY_REFRESH_INTERVAL = float(
+    os.getenv("MAILBOX_INVENTORY_REFRESH_INTERVAL", str(MAILBOX_INVENTORY_TTL_SECONDS))
+)
+
+
+@dataclass(frozen=True)
+class MailboxSnapshot:
+    """Immutable view of all domain mailboxes at one point in time"""
+    mailboxes: List[Dict[str, Any]]
+    fetched_at: float
+    by_username: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, mailboxes: List[Dict[str, Any]]) -> "MailboxSnapshot":
+        """Index mailboxes by local part and precompute aggregate statistics"""
+        by_username = {}
+        for mb in mailboxes:
+            email = mb.get("username", "")
+            by_username[email.split("@")[0] if "@" in email else email] = mb
+
+        stats = {
+            "total_mailboxes": len(mailboxes),
+            "active_mailboxes": sum(1 for mb in mailboxes if mb.get("active", 0) == 1),
+            "total_quota_mb": sum(int(mb.get("quota", 0) / (1024 * 1024)) for mb in mailboxes),
+            "total_used_mb": sum(int(mb.get("bytes", 0) / (1024 * 1024)) for mb in mailboxes),
+        }
+
+        return cls(mailboxes=mailboxes, fetched_at=time.time(), by_username=by_username, stats=stats)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class MailboxInventory:
+    """Stale-while-revalidate cache around AsyncMailcowAPI.get_all_mailboxes"""
+
+    def __init__(
+        self,
+        ttl: float = MAILBOX_INVENTORY_TTL_SECONDS,
+        max_stale: float = MAILBOX_INVENTORY_MAX_STALE_SECONDS,
+        refresh_interval: float = MAILBOX_INVENTORY_REFRESH_INTERVAL,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[MailboxSnapshot] = None
+        # Bumped by invalidate(); a fetch started before a write must not
+        # overwrite data fetched after it or mark the inventory clean.
+        self._generation = 0
+        self._snapshot_generation = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def get(self) -> Optional[MailboxSnapshot]:
+        """
+        Return the current snapshot.
+
+        Fresh snapshots are returned directly; stale ones are returned while a
+        background refresh runs. Without a usable snapshot (none yet, too old,
+        or invalidated by a write) the caller waits for the shared refresh.
+
+        Returns:
+            MailboxSnapshot, or None if Mailcow could not be reached
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._snapshot_generation == self._generation:
+            if snapshot.age < self.ttl:
+                return snapshot
+            if snapshot.age < self.max_stale:
+                self._start_refresh()
+                return snapshot
+
+        snapshot = await self.refresh()
+        if snapshot is not None and snapshot.age < self.max_stale:
+            return snapshot
+        return None
+
+    async def refresh(self) -> Optional[MailboxSnapshot]:
+        """Refresh the snapshot, joining an in-flight refresh if there is one"""
+        return await asyncio.shield(self._start_refresh())
+
+    def invalidate(self) -> None:
+        """Force the next read to wait for fresh data (after admin writes)"""
+        self._generation += 1
+        self._refresh_task = None
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def _fetch(self) -> Optional[MailboxSnapshot]:
+        generation = self._generation
+        mailboxes = await get_async_mailcow_client().get_all_mailboxes()
+        if mailboxes is None:
+            # Keep serving the last good snapshot until it is too old
+            logger.warning("Mailbox inventory refresh failed")
+            return self._snapshot
+
+        snapshot = MailboxSnapshot.build(mailboxes)
+        if generation < self._snapshot_generation:
+            return snapshot
+        self._snapshot = snapshot
+        self._snapshot_generation = generation
+        logger.debug(f"Mailbox inventory refreshed: {len(mailboxes)} mailboxes")
+        return self._snapshot
+
+    async def _run_periodic(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Mailbox inventory refresh error: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Start background refreshing (no-op without a Mailcow API key)"""
+        if not MAILCOW_API_KEY or self._loop_task is not None:
+            return
+        self._loop_task = asyncio.create_task(self._run_periodic())
+
+    async def stop(self) -> None:
+        """Cancel background refreshing"""
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop_task = None
+        self._refresh_task = None
+
+
+mailbox_inventory = MailboxInventory()
@@ -0,0 +1,64 @@
+"""
+Markdown Rendering
+
+Page and news content is authored in Markdown. It is rendered to sanitized
+HTML once when an article or page is written (create/update endpoints, seed
+and backfill scripts) and stored next to the source in `content_html`,
+together with a SHA-256 `content_hash` of the Markdown, so readers get
+ready-to-display HTML and unchanged content is never rendered twice.
+"""
+
+import hashlib
+from typing import Any
+
+import bleach
+import markdown
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+
+ALLOWED_TAGS = {
+    "a", "abbr", "blockquote", "br", "code", "dd", "del", "div", "dl", "dt", "em",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "img", "li", "ol", "p", "pre",
+    "span", "strong", "sub", "sup", "table", "tbody", "td", "th", "thead", "tr", "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title", "rel"],
+    "abbr": ["title"],
+    "img": ["src", "alt", "title"],
+    "td": ["align"],
+    "th": ["align"],
+    "*": ["id", "class"],
+}
+ALLOWED_PROTOCOLS = {"http", "https", "mailto"}
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the Markdown source"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def render_markdown(text: str) -> str:
+    """Render Markdown to HTML and strip anything outside the allow-list"""
+    html = markdown.markdown(text or "", extensions=MARKDOWN_EXTENSIONS, output_format="html")
+    return bleach.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+    )
+
+
+def apply_rendered_content(obj: Any) -> bool:
+    """
+    Refresh `content_html`/`content_hash` of a Page or News row from `content`.
+
+    Returns:
+        True if the content was (re-)rendered, False if it was up to date
+    """
+    digest = content_hash(obj.content)
+    if obj.content_hash == digest and obj.content_html is not None:
+        return False
+    obj.content_html = render_markdown(obj.content)
+    obj.content_hash = digest
+    return True
@@ -0,0 +1,78 @@
+"""
+Rendered Page Cache
+
+Public pages (privacy policy, imprint, ...) change only when an admin edits
+them, so `/api/pages/public/{slug}` serves them from memory. Each entry holds
+the serialized PageResponse JSON plus its ETag and pre-compressed gzip (and,
+when the `brotli` package is installed, brotli) bodies, keyed by
+(slug, language). The page admin endpoints invalidate affected entries; the
+TTL bounds staleness for other worker processes.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from ..cache import TTLCache
+from ..http_cache import make_etag
+from ..models import Page
+from ..schemas import PageResponse
+
+try:
+    import brotli
+except ImportError:  # optional: without it clients get gzip
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("PAGE_CACHE_TTL_SECONDS", "3600"))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "256"))
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """A public page serialized once and pre-compressed"""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    gzip_body: bytes
+    brotli_body: Optional[bytes] = None
+
+    def encoded(self, accept_encoding: str):
+        """
+        Pick the smallest body the client accepts.
+
+        Returns:
+            (body, Content-Encoding value or None)
+        """
+        accepted = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        if self.brotli_body is not None and "br" in accepted:
+            return self.brotli_body, "br"
+        if "gzip" in accepted:
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+
+def render_page(page: Page) -> RenderedPage:
+    """Serialize and compress a page for the public endpoint"""
+    body = PageResponse.from_orm(page).json().encode("utf-8")
+    return RenderedPage(
+        body=body,
+        etag=make_etag(hashlib.sha1(body).hexdigest()),
+        last_modified=page.updated_at,
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        brotli_body=brotli.compress(body) if brotli is not None else None,
+    )
+
+
+page_cache = TTLCache(max_entries=PAGE_CACHE_MAX_ENTRIES, default_ttl=PAGE_CACHE_TTL_SECONDS)
+
+
+def invalidate_page(slug: str, language: str) -> None:
+    """Drop the cached rendering of one (slug, language) page"""
+    if page_cache.pop((slug, language)) is not None:
+        logger.info(f"Invalidated cached page {slug} ({language})")
@@ -0,0 +1,224 @@
+"""
+Recipe Generation Cache
+
+Stores Gemini results in the ai_suggestions table, keyed by a hash of the
+normalized inputs (sorted ingredients, dietary preference, language), so
+identical requests are answered from the database instead of a multi-second
+model call. Requests without ingredients ask for a random recipe and bypass
+the cache, since a cached answer would pin every caller to one recipe.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import AISuggestion
+from .ai_gemini import chunk_text, generate_recipe, stream_recipe
+
+logger = logging.getLogger(__name__)
+
+RECIPE_CACHE_TTL_SECONDS = int(os.getenv("RECIPE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv("RECIPE_CACHE_MAX_ENTRIES", "1000"))
+
+
+def normalize_ingredients(ingredients: Optional[List[str]]) -> List[str]:
+    """Lowercase, trim, de-duplicate and sort ingredient names"""
+    return sorted({i.strip().lower() for i in ingredients or [] if i and i.strip()})
+
+
+def make_cache_key(
+    ingredients: Optional[List[str]] = None,
+    dietary_preferences: Optional[str] = None,
+    language: str = "de",
+) -> str:
+    """Stable sha256 key for a generation request"""
+    payload = json.dumps(
+        {
+            "ingredients": normalize_ingredients(ingredients),
+            "dietary": (dietary_preferences or "").strip().lower(),
+            "language": (language or "de").strip().lower(),
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_recipe(db: Session, cache_key: str) -> Optional[AISuggestion]:
+    """Return the newest unexpired cache entry for a key"""
+    cutoff = datetime.utcnow() - timedelta(seconds=RECIPE_CACHE_TTL_SECONDS)
+    return (
+        db.query(AISuggestion)
+        .filter(AISuggestion.cache_key == cache_key, AISuggestion.created_at >= cutoff)
+        .order_by(AISuggestion.created_at.desc())
+        .first()
+    )
+
+
+def store_recipe(
+    db: Session,
+    cache_key: str,
+    result: dict,
+    ingredients: Optional[List[str]] = None,
+    dietary_preferences: Optional[str] = None,
+    language: str = "de",
+) -> AISuggestion:
+    """Persist a generated recipe and trim the cache"""
+    now = datetime.utcnow()
+    entry = AISuggestion(
+        text=result["text"],
+        dietary=dietary_preferences,
+        cache_key=cache_key,
+        language=language,
+        ingredients=json.dumps(normalize_ingredients(ingredients), ensure_ascii=False),
+        model=result.get("model"),
+        hit_count=0,
+        created_at=now,
+        last_used_at=now,
+    )
+    db.add(entry)
+    db.commit()
+    evict_expired_and_overflow(db)
+    return entry
+
+
+def evict_expired_and_overflow(db: Session) -> int:
+    """
+    Delete expired entries and, beyond RECIPE_CACHE_MAX_ENTRIES, the least
+    recently used ones.
+
+    Returns:
+        Number of deleted rows
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=RECIPE_CACHE_TTL_SECONDS)
+    deleted = (
+        db.query(AISuggestion)
+        .filter(AISuggestion.cache_key.isnot(None), AISuggestion.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+    overflow_ids = [
+        row.id
+        for row in db.query(AISuggestion.id)
+        .filter(AISuggestion.cache_key.isnot(None))
+        .order_by(AISuggestion.last_used_at.desc(), AISuggestion.id.desc())
+        .offset(RECIPE_CACHE_MAX_ENTRIES)
+        .all()
+    ]
+    if overflow_ids:
+        deleted += (
+            db.query(AISuggestion)
+            .filter(AISuggestion.id.in_(overflow_ids))
+            .delete(synchronize_session=False)
+        )
+
+    if deleted:
+        db.commit()
+        logger.debug(f"Recipe cache evicted {deleted} entries")
+    return deleted
+
+
+def generate_recipe_cached(
+    db: Session,
+    ingredients: Optional[List[str]] = None,
+    dietary_preferences: Optional[str] = None,
+    language: str = "de",
+) -> dict:
+    """
+    generate_recipe() with a persistent result cache.
+
+    Fallback recipes (model unavailable) and random recipes (no ingredients)
+    are never cached.
+
+    Returns:
+        Dict with "text", "model" and "cached" (True when served from cache)
+    """
+    if not normalize_ingredients(ingredients):
+        result = generate_recipe(
+            ingredients=ingredients, dietary_preferences=dietary_preferences, language=language
+        )
+        return {**result, "cached": False}
+
+    cache_key = make_cache_key(ingredients, dietary_preferences, language)
+
+    entry = get_cached_recipe(db, cache_key)
+    if entry is not None:
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        db.commit()
+        return {"text": entry.text, "model": entry.model, "cached": True}
+
+    result = generate_recipe(
+        ingredients=ingredients, dietary_preferences=dietary_preferences, language=language
+    )
+    if result.get("model") != "fallback":
+        try:
+            store_recipe(db, cache_key, result, ingredients, dietary_preferences, language)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to cache generated recipe: {str(e)}")
+
+    return {**result, "cached": False}
+
+
+def stream_recipe_cached(
+    db: Session,
+    ingredients: Optional[List[str]] = None,
+    dietary_preferences: Optional[str] = None,
+    language: str = "de",
+) -> Iterator[dict]:
+    """
+    stream_recipe() with the same cache as generate_recipe_cached().
+
+    The cache lookup happens immediately (using db); a completed stream is
+    stored afterwards with a separate session, since the response may
+    outlive the request's session. Random recipes (no ingredients) bypass
+    the cache.
+    """
+    if not normalize_ingredients(ingredients):
+        return _stream_and_store(None, ingredients, dietary_preferences, language)
+
+    cache_key = make_cache_key(ingredients, dietary_preferences, language)
+
+    entry = get_cached_recipe(db, cache_key)
+    if entry is not None:
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        db.commit()
+        return _replay_cached(entry.text, entry.model)
+
+    return _stream_and_store(cache_key, ingredients, dietary_preferences, language)
+
+
+def _replay_cached(text: str, model: Optional[str]) -> Iterator[dict]:
+    yield {"event": "start", "model": model, "cached": True}
+    for chunk in chunk_text(text):
+        yield {"event": "chunk", "text": chunk}
+    yield {"event": "done", "model": model, "text": text, "cached": True}
+
+
+def _stream_and_store(
+    cache_key: Optional[str],
+    ingredients: Optional[List[str]],
+    dietary_preferences: Optional[str],
+    language: str,
+) -> Iterator[dict]:
+    for event in stream_recipe(ingredients, dietary_preferences, language):
+        if cache_key and event["event"] == "done" and event.get("model") != "fallback":
+            db = SessionLocal()
+            try:
+                store_recipe(db, cache_key, event, ingredients, dietary_preferences, language)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to cache streamed recipe: {str(e)}")
+            finally:
+                db.close()
+        if event["event"] in ("start", "done"):
+            event = {**event, "cached": False}
+        yield event
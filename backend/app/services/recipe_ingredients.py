@@ -0,0 +1,70 @@
+"""
+Recipe Ingredient Rows
+
+Keeps the normalized `recipe_ingredients` table in step with the JSON text
+stored in Recipe.ingredients, and builds the SQL filters used to find
+recipes by ingredient without loading and parsing every recipe in Python.
+Each row's normalized key is also split into `recipe_ingredient_tokens`, so
+word lookups are equality matches on an indexed column.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Recipe, RecipeIngredient, RecipeIngredientToken
+from .recipe_matcher import normalize_ingredient_name, parse_ingredient_list
+
+
+def build_ingredient_rows(raw: Optional[str]) -> List[RecipeIngredient]:
+    """Parse Recipe.ingredients JSON text into (unsaved) RecipeIngredient rows"""
+    return [
+        RecipeIngredient(
+            position=position,
+            name=parsed.name[:300],
+            quantity=parsed.quantity,
+            unit=parsed.unit,
+            normalized_key=parsed.key[:300],
+            tokens=[RecipeIngredientToken(token=token) for token in ingredient_tokens(parsed.key)],
+        )
+        for position, parsed in enumerate(parse_ingredient_list(raw))
+    ]
+
+
+def sync_recipe_ingredients(recipe: Recipe) -> None:
+    """Replace a recipe's ingredient rows with ones parsed from recipe.ingredients"""
+    recipe.ingredient_items = build_ingredient_rows(recipe.ingredients)
+
+
+def ingredient_tokens(key: str) -> List[str]:
+    """Distinct words of a normalized key, as stored in recipe_ingredient_tokens"""
+    return sorted({token[:100] for token in key.split()})
+
+
+def ingredient_key_clause(name: str) -> Optional[ColumnElement]:
+    """
+    SQL condition matching ingredient rows for a free-text ingredient name.
+
+    A row matches when its normalized key contains every word of the
+    normalized name ("pepper" matches "bell pepper"). Words are looked up by
+    equality on the token index, never with a leading-wildcard LIKE.
+
+    Returns:
+        Clause on RecipeIngredient.id, or None if the name has no usable words
+    """
+    tokens = ingredient_tokens(normalize_ingredient_name(name))
+    if not tokens:
+        return None
+    if len(tokens) == 1:
+        matching = select(RecipeIngredientToken.ingredient_id).where(
+            RecipeIngredientToken.token == tokens[0]
+        )
+    else:
+        matching = (
+            select(RecipeIngredientToken.ingredient_id)
+            .where(RecipeIngredientToken.token.in_(tokens))
+            .group_by(RecipeIngredientToken.ingredient_id)
+            .having(func.count(RecipeIngredientToken.token) == len(tokens))
+        )
+    return RecipeIngredient.id.in_(matching)
@@ -0,0 +1,181 @@
+"""
+Recipe Generation Jobs
+
+Runs generate_recipe_cached() on a bounded worker pool so the HTTP request
+that starts a generation returns a job id immediately instead of holding a
+threadpool worker for the whole Gemini call. Clients poll (or long-poll)
+the job for its result.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..database import SessionLocal
+from .recipe_cache import generate_recipe_cached
+
+logger = logging.getLogger(__name__)
+
+RECIPE_JOB_WORKERS = int(os.getenv("RECIPE_JOB_WORKERS", "2"))
+# Queued + running jobs accepted before new submissions are rejected
+RECIPE_JOB_MAX_PENDING = int(os.getenv("RECIPE_JOB_MAX_PENDING", "20"))
+# How long finished jobs stay retrievable
+RECIPE_JOB_RESULT_TTL_SECONDS = int(os.getenv("RECIPE_JOB_RESULT_TTL_SECONDS", "600"))
+
+
+class JobQueueFullError(Exception):
+    """Raised when the queue is saturated (mapped to HTTP 429)"""
+
+
+@dataclass
+class RecipeJob:
+    id: str
+    kind: str
+    status: str = "queued"  # queued | running | done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class RecipeJobQueue:
+    """Bounded thread pool with job bookkeeping and backpressure"""
+
+    def __init__(
+        self,
+        workers: int = RECIPE_JOB_WORKERS,
+        max_pending: int = RECIPE_JOB_MAX_PENDING,
+        result_ttl: int = RECIPE_JOB_RESULT_TTL_SECONDS,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, RecipeJob] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="recipe-job")
+        return self._executor
+
+    def _purge_finished(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, kind: str, fn: Callable[..., dict], *args, **kwargs) -> RecipeJob:
+        """
+        Queue fn(*args, **kwargs) as a job.
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued/running
+        """
+        with self._lock:
+            self._purge_finished()
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFullError("Recipe generation queue is full")
+            job = RecipeJob(id=uuid.uuid4().hex, kind=kind)
+            # Published only once it has a future, so get() + wait() never see
+            # a job that cannot be long-polled yet. The worker takes the lock
+            # only when the job ends, so submitting while holding it is safe.
+            job.future = self._get_executor().submit(self._run, job, fn, args, kwargs)
+            self._jobs[job.id] = job
+            self._pending += 1
+            self.submitted += 1
+        return job
+
+    def _run(self, job: RecipeJob, fn: Callable[..., dict], args: tuple, kwargs: dict) -> Optional[dict]:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "done"
+        except Exception as e:
+            logger.error(f"Recipe job {job.id} failed: {str(e)}")
+            job.error = str(e)
+            job.status = "failed"
+            with self._lock:
+                self.failed += 1
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._pending -= 1
+        return job.result
+
+    def get(self, job_id: str) -> Optional[RecipeJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def wait(self, job: RecipeJob, timeout: float) -> RecipeJob:
+        """Wait up to timeout seconds for a job to finish without blocking the loop"""
+        if timeout > 0 and job.future is not None and not job.future.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "tracked_jobs": len(self._jobs),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "failed": self.failed,
+            }
+
+
+def run_generation_job(
+    ingredients: Optional[List[str]] = None,
+    dietary_preferences: Optional[str] = None,
+    language: str = "de",
+) -> dict:
+    """Job body: generate (or fetch cached) recipe with its own DB session"""
+    db = SessionLocal()
+    try:
+        return generate_recipe_cached(
+            db, ingredients=ingredients, dietary_preferences=dietary_preferences, language=language
+        )
+    finally:
+        db.close()
+
+
+recipe_jobs = RecipeJobQueue()
@@ -0,0 +1,250 @@
+"""
+Recipe Matcher
+
+Answers "what can I cook with my pantry?" from stored recipes before paying
+for an AI call. Each recipe's JSON ingredient list is parsed into normalized
+tokens once; an inverted index token -> recipe ids narrows candidates, which
+are ranked by how many of their ingredients the pantry covers (all of an
+ingredient's tokens present in one pantry item).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..models import Recipe
+
+logger = logging.getLogger(__name__)
+
+# Rebuild interval, so workers also pick up recipes written by other processes
+RECIPE_MATCH_INDEX_TTL_SECONDS = int(os.getenv("RECIPE_MATCH_INDEX_TTL_SECONDS", "300"))
+# Minimum share of a recipe's ingredients the pantry must cover to skip the AI
+RECIPE_MATCH_MIN_COVERAGE = float(os.getenv("RECIPE_MATCH_MIN_COVERAGE", "0.6"))
+
+# Longest first, so "c. à s." wins over "c"
+UNITS = sorted(
+    {
+        "g", "kg", "mg", "ml", "cl", "dl", "l", "el", "tl", "tbsp", "tsp", "cup", "cups",
+        "tasse", "tassen", "oz", "lb", "lbs", "prise", "pinch", "stück", "stk", "pc", "pcs",
+        "piece", "pieces", "clove", "cloves", "gousse", "gousses", "scheibe", "scheiben",
+        "slice", "slices", "bund", "bunch", "dose", "can", "c. à s.", "c. à c.",
+        "cuillère à soupe", "cuillère à café", "大さじ", "小さじ",
+    },
+    key=len,
+    reverse=True,
+)
+STOPWORDS = {
+    "of", "de", "d", "du", "des", "la", "le", "les", "à", "a", "the", "and", "und", "et",
+    "fresh", "frisch", "frische", "frischer", "optional", "optionnel", "some", "etwas",
+}
+
+_QUANTITY_RE = re.compile(r"^\s*(\d+(?:[.,]\d+)?(?:\s*/\s*\d+)?)\s*")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class ParsedIngredient:
+    """One ingredient line split into quantity, unit and normalized name"""
+    quantity: Optional[float]
+    unit: Optional[str]
+    name: str
+    key: str  # normalized, space-separated stemmed tokens
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        return frozenset(self.key.split())
+
+
+def _parse_quantity(raw: str) -> Optional[float]:
+    raw = raw.replace(",", ".").replace(" ", "")
+    try:
+        if "/" in raw:
+            numerator, denominator = raw.split("/", 1)
+            return float(numerator) / float(denominator)
+        return float(raw)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def stem(token: str) -> str:
+    """Very small language-agnostic plural stripper ("tomatoes" -> "tomato", "karotten" -> "karott")"""
+    if len(token) > 4 and token.endswith("oes"):
+        return token[:-2]
+    for suffix in ("es", "en", "s", "n", "e"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[: -len(suffix)]
+    return token
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """Lowercase, drop stopwords and stem the remaining words"""
+    words = [w for w in _WORD_RE.findall(name.lower()) if w not in STOPWORDS]
+    return " ".join(stem(w) for w in words)
+
+
+def parse_ingredient(text: str) -> ParsedIngredient:
+    """
+    Parse a free-text ingredient line such as "200g Pasta" or
+    "2 c. à s. sauce soja".
+    """
+    rest = _PARENS_RE.sub(" ", text or "").strip().lower()
+
+    quantity = None
+    match = _QUANTITY_RE.match(rest)
+    if match:
+        quantity = _parse_quantity(match.group(1))
+        rest = rest[match.end():]
+
+    unit = None
+    for candidate in UNITS:
+        if rest.startswith(candidate) and (
+            len(rest) == len(candidate) or not rest[len(candidate)].isalpha()
+        ):
+            unit = candidate
+            rest = rest[len(candidate):]
+            break
+
+    name = rest.strip(" .,;:-")
+    return ParsedIngredient(quantity=quantity, unit=unit, name=name, key=normalize_ingredient_name(name))
+
+
+def parse_ingredient_list(raw: Optional[str]) -> List[ParsedIngredient]:
+    """Parse the JSON text stored in Recipe.ingredients (invalid JSON -> empty)"""
+    try:
+        items = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(items, list):
+        return []
+    parsed = [parse_ingredient(str(item)) for item in items if item]
+    return [p for p in parsed if p.key]
+
+
+@dataclass(frozen=True)
+class _IndexedRecipe:
+    id: int
+    language: str
+    ingredients: tuple  # tuple of FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class _MatchIndex:
+    """Recipes and their inverted index, built together and swapped as one"""
+    recipes: Dict[int, _IndexedRecipe]
+    index: Dict[str, Set[int]]
+
+
+class RecipeMatcher:
+    """In-memory inverted index over stored recipes"""
+
+    def __init__(self, ttl: int = RECIPE_MATCH_INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._snapshot = _MatchIndex(recipes={}, index={})
+        self._built_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Rebuild on next use (call after recipes are created or deleted)"""
+        self._built_at = None
+
+    def rebuild(self, db: Session) -> None:
+        recipes: Dict[int, _IndexedRecipe] = {}
+        index: Dict[str, Set[int]] = {}
+        rows = db.query(Recipe.id, Recipe.language, Recipe.ingredients).yield_per(500)
+        for recipe_id, language, raw in rows:
+            ingredients = tuple(p.tokens for p in parse_ingredient_list(raw))
+            if not ingredients:
+                continue
+            recipes[recipe_id] = _IndexedRecipe(recipe_id, language, ingredients)
+            for tokens in ingredients:
+                for token in tokens:
+                    index.setdefault(token, set()).add(recipe_id)
+
+        # Single assignment, so readers never pair a new index with old recipes
+        self._snapshot = _MatchIndex(recipes=recipes, index=index)
+        self._built_at = time.time()
+        logger.debug(f"Recipe match index built: {len(recipes)} recipes, {len(index)} tokens")
+
+    def _ensure_built(self, db: Session) -> None:
+        if self._built_at is not None and time.time() - self._built_at < self.ttl:
+            return
+        with self._lock:
+            if self._built_at is None or time.time() - self._built_at >= self.ttl:
+                self.rebuild(db)
+
+    def match(self, db: Session, pantry: List[str], language: str = "de", limit: int = 5) -> List[dict]:
+        """
+        Rank stored recipes by pantry coverage.
+
+        Returns:
+            List of {"recipe_id", "coverage", "matched", "total"}, best first
+        """
+        self._ensure_built(db)
+
+        # An ingredient counts as covered only if one pantry item has all of
+        # its tokens ("chicken stock" does not cover "chicken breast")
+        pantry_items = {parse_ingredient(item).tokens for item in pantry}
+        pantry_items.discard(frozenset())
+
+        snapshot = self._snapshot
+        recipes, index = snapshot.recipes, snapshot.index
+        candidates: Set[int] = set()
+        for tokens in pantry_items:
+            for token in tokens:
+                candidates.update(index.get(token, ()))
+
+        ranked = []
+        for recipe_id in candidates:
+            recipe = recipes[recipe_id]
+            if recipe.language != language:
+                continue
+            matched = sum(
+                1 for tokens in recipe.ingredients if any(tokens <= item for item in pantry_items)
+            )
+            total = len(recipe.ingredients)
+            ranked.append({
+                "recipe_id": recipe_id,
+                "coverage": round(matched / total, 3),
+                "matched": matched,
+                "total": total,
+            })
+
+        ranked.sort(key=lambda m: (m["coverage"], m["matched"]), reverse=True)
+        return ranked[:limit]
+
+
+RECIPE_SECTION_TITLES = {
+    "de": ("Zutaten", "Zubereitung"),
+    "en": ("Ingredients", "Instructions"),
+    "fr": ("Ingrédients", "Instructions"),
+}
+
+
+def recipe_to_markdown(recipe: Recipe) -> str:
+    """Render a stored recipe in the same markdown shape as AI recipes"""
+    ingredients_title, instructions_title = RECIPE_SECTION_TITLES.get(
+        recipe.language, RECIPE_SECTION_TITLES["en"]
+    )
+    try:
+        ingredients = json.loads(recipe.ingredients) if recipe.ingredients else []
+    except ValueError:
+        ingredients = []
+
+    lines = [f"# {recipe.name}", ""]
+    if recipe.description:
+        lines += [recipe.description, ""]
+    if ingredients:
+        lines += [f"## {ingredients_title}:"] + [f"- {item}" for item in ingredients] + [""]
+    lines += [f"## {instructions_title}:", recipe.instructions]
+    return "\n".join(lines)
+
+
+recipe_matcher = RecipeMatcher()
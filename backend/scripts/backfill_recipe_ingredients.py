@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Backfill recipe_ingredients from the JSON text in recipes.ingredients
+
+Streams recipes in id order, BATCH_SIZE at a time, and commits per batch so
+large tables neither load into memory nor hold one long transaction.
+
+Usage:
+    python scripts/backfill_recipe_ingredients.py [--batch-size 500] [--rebuild]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import exists, select
+
+from app.database import SessionLocal
+from app.models import Recipe, RecipeIngredient, RecipeIngredientToken
+from app.services.recipe_ingredients import build_ingredient_rows, ingredient_tokens
+
+
+def backfill(batch_size: int = 500, rebuild: bool = False) -> int:
+    """Create ingredient rows for recipes that have none (all recipes with rebuild)"""
+    db = SessionLocal()
+    last_id = 0
+    recipes_done = 0
+    rows_written = 0
+
+    try:
+        while True:
+            query = db.query(Recipe.id, Recipe.ingredients).filter(Recipe.id > last_id)
+            if not rebuild:
+                query = query.filter(~exists().where(RecipeIngredient.recipe_id == Recipe.id))
+            batch = query.order_by(Recipe.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            ids = [recipe_id for recipe_id, _ in batch]
+            if rebuild:
+                stale = select(RecipeIngredient.id).where(RecipeIngredient.recipe_id.in_(ids))
+                db.query(RecipeIngredientToken).filter(
+                    RecipeIngredientToken.ingredient_id.in_(stale)
+                ).delete(synchronize_session=False)
+                db.query(RecipeIngredient).filter(
+                    RecipeIngredient.recipe_id.in_(ids)
+                ).delete(synchronize_session=False)
+
+            mappings = []
+            for recipe_id, raw in batch:
+                for row in build_ingredient_rows(raw):
+                    mappings.append({
+                        "recipe_id": recipe_id,
+                        "position": row.position,
+                        "name": row.name,
+                        "quantity": row.quantity,
+                        "unit": row.unit,
+                        "normalized_key": row.normalized_key,
+                    })
+            if mappings:
+                # return_defaults fills in the new ids, needed for the token rows
+                db.bulk_insert_mappings(RecipeIngredient, mappings, return_defaults=True)
+                db.bulk_insert_mappings(RecipeIngredientToken, [
+                    {"ingredient_id": mapping["id"], "token": token}
+                    for mapping in mappings
+                    for token in ingredient_tokens(mapping["normalized_key"])
+                ])
+            db.commit()
+
+            last_id = ids[-1]
+            recipes_done += len(batch)
+            rows_written += len(mappings)
+            print(f"  ... {recipes_done} recipes, {rows_written} ingredient rows (last id {last_id})")
+
+        print(f"✅ Backfilled {rows_written} ingredient rows for {recipes_done} recipes")
+        return recipes_done
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse recipes that already have rows")
+    args = parser.parse_args()
+    backfill(batch_size=args.batch_size, rebuild=args.rebuild)
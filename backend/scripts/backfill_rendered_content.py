@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Render Markdown content of pages and news into content_html
+
+Only rows whose content_hash is missing or no longer matches the Markdown
+source are re-rendered (all rows with --rebuild). Rows are processed in id
+order, BATCH_SIZE at a time, with one commit per batch.
+
+Usage:
+    python scripts/backfill_rendered_content.py [--batch-size 200] [--rebuild]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.models import News, Page
+from app.services.markdown_render import apply_rendered_content
+
+
+def backfill(model, batch_size: int = 200, rebuild: bool = False) -> int:
+    """Render content_html for one model; returns the number of rows rendered"""
+    db = SessionLocal()
+    last_id = 0
+    rendered = 0
+
+    try:
+        while True:
+            batch = db.query(model).filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            for row in batch:
+                if rebuild:
+                    row.content_hash = None
+                if apply_rendered_content(row):
+                    rendered += 1
+            db.commit()
+
+            last_id = batch[-1].id
+            print(f"  ... {model.__tablename__}: {rendered} rendered (last id {last_id})")
+
+        print(f"✅ Rendered {rendered} {model.__tablename__} rows")
+        return rendered
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--rebuild", action="store_true", help="Re-render rows that are up to date")
+    args = parser.parse_args()
+    for model in (Page, News):
+        backfill(model, batch_size=args.batch_size, rebuild=args.rebuild)
@@ -7,6 +7,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import SessionLocal, engine, Base
 from app.models import Page
+from app.services.markdown_render import apply_rendered_content
 from sqlalchemy import text
 
 def init_pages():
@@ -66,6 +67,7 @@ def init_pages():
         
         # Add all pages to database
         for page in pages:
+            apply_rendered_content(page)
             db.add(page)
         
         db.commit()
@@ -35,7 +35,9 @@ export const shoppingListsAPI = {
 
 // Recipes API
 export const recipesAPI = {
-  getAll: (healthyOnly = false) => api.get('/recipes/', { params: { healthy_only: healthyOnly, language: getCurrentLanguage() } }),
+  getAll: (healthyOnly = false, cursor = null, fields = null) => api.get('/recipes/', {
+    params: { healthy_only: healthyOnly, language: getCurrentLanguage(), cursor, fields }
+  }),
   getById: (id) => api.get(`/recipes/${id}`),
   create: (data) => api.post('/recipes/', data),
   delete: (id) => api.delete(`/recipes/${id}`),
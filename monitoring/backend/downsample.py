@@ -0,0 +1,90 @@
+"""
+Time Series Downsampling
+Shape-preserving reduction of history series to a target number of points,
+so chart payloads stay flat however long the requested range is
+"""
+
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each of `threshold - 2` equal
+    buckets, the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. Work inside each bucket is
+    vectorized; only the walk over buckets is a Python loop.
+
+    Returns:
+        Sorted indices of the points to keep
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Average of every bucket, used as the third triangle vertex
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        prev_x, prev_y = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs(
+            (prev_x - next_x) * (y[lo:hi] - prev_y) - (prev_x - x[lo:hi]) * (next_y - prev_y)
+        )
+        previous = lo + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Min/max per bucket: split into `(threshold - 2) // 2` equal-width buckets
+    and keep each bucket's lowest and highest point plus the first and last
+    point, so spikes are never lost and at most `threshold` points remain.
+
+    Returns:
+        Sorted, unique indices of the points to keep
+    """
+    n = len(x)
+    if threshold >= n or n == 0:
+        return np.arange(n)
+    buckets = (threshold - 2) // 2
+    if buckets < 1:
+        return np.array([0, n - 1])
+
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    # Sort each bucket's values by (bucket, value) once, then read both ends
+    bucket_of = np.repeat(np.arange(buckets), np.diff(edges))
+    order = np.lexsort((y, bucket_of))
+    ends = edges[1:] - 1
+    keep = np.concatenate([order[starts], order[ends], [0, n - 1]])
+    return np.unique(keep)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, threshold: int, method: str = "lttb") -> np.ndarray:
+    """
+    Indices of the points to keep.
+
+    Raises:
+        ValueError: For an unknown method
+    """
+    if method == "lttb":
+        return lttb(x, y, threshold)
+    if method == "minmax":
+        return minmax(x, y, threshold)
+    raise ValueError(f"method must be one of {', '.join(METHODS)}")
@@ -0,0 +1,290 @@
+"""
+Monitoring History Store
+Fixed-capacity, array-backed time series for the dashboard trend charts
+"""
+
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Retention per resolution (number of points): two days of raw 30s samples,
+# 30 days of 5-minute and one year of hourly averages
+HISTORY_RAW_POINTS = int(os.getenv("HISTORY_RAW_POINTS", "5760"))
+HISTORY_5M_POINTS = int(os.getenv("HISTORY_5M_POINTS", "8640"))
+HISTORY_1H_POINTS = int(os.getenv("HISTORY_1H_POINTS", "8760"))
+# Per-mailbox series keep less: raw for one day, 5-minute for a week, hourly for 90 days
+HISTORY_MAILBOX_RAW_POINTS = int(os.getenv("HISTORY_MAILBOX_RAW_POINTS", "2880"))
+HISTORY_MAILBOX_5M_POINTS = int(os.getenv("HISTORY_MAILBOX_5M_POINTS", "2016"))
+HISTORY_MAILBOX_1H_POINTS = int(os.getenv("HISTORY_MAILBOX_1H_POINTS", "2160"))
+
+# Resolution name -> bucket width in seconds (0 = raw samples)
+RESOLUTIONS: Dict[str, int] = {"raw": 0, "5m": 300, "1h": 3600}
+
+TOTAL_FIELDS = ("total_used_mb", "average_usage_percent", "mailbox_count")
+MAILBOX_FIELDS = ("used_mb", "usage_percent")
+
+
+class RingBuffer:
+    """
+    Fixed-capacity time series stored in preallocated numpy arrays.
+
+    Every value is written twice, at ``i`` and ``i + capacity``, so the live
+    window ``[start, start + size)`` is always one contiguous slice: appends
+    are O(1) and reads return views without copying. Views are only valid
+    until the next append, so callers must consume them before yielding to
+    the event loop.
+    """
+
+    def __init__(self, capacity: int, fields: Iterable[str]):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        # float32 is plenty for MB / percent values and halves the footprint
+        self._values = {name: np.zeros(2 * capacity, dtype=np.float32) for name in self.fields}
+        self._start = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> None:
+        """Add a sample, overwriting the oldest one when full"""
+        if self.size < self.capacity:
+            index = (self._start + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        for i in (index, index + self.capacity):
+            self._timestamps[i] = timestamp
+            for name in self.fields:
+                self._values[name][i] = values.get(name, 0.0)
+
+    def extend(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """Vectorized append of many samples (oldest first), e.g. a warm load"""
+        count = len(timestamps)
+        if count == 0:
+            return
+        if count > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            values = {name: column[-self.capacity:] for name, column in values.items()}
+            count = self.capacity
+        positions = (self._start + self.size + np.arange(count)) % self.capacity
+        for offset in (0, self.capacity):
+            self._timestamps[positions + offset] = timestamps
+            for name in self.fields:
+                self._values[name][positions + offset] = values[name] if name in values else 0.0
+        end = (self._start + self.size + count) % self.capacity
+        self.size = min(self.capacity, self.size + count)
+        self._start = (end - self.size) % self.capacity
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """All timestamps (epoch seconds), oldest first, as a view"""
+        return self._timestamps[self._start:self._start + self.size]
+
+    def last_timestamp(self) -> Optional[float]:
+        return float(self._timestamps[self._start + self.size - 1]) if self.size else None
+
+    def range(
+        self, start: Optional[float] = None, end: Optional[float] = None, limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Samples with start <= timestamp <= end (newest `limit` of them).
+
+        Returns:
+            (timestamps, {field: values}) as views into the buffer
+        """
+        timestamps = self.timestamps
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = self.size if end is None else int(np.searchsorted(timestamps, end, side="right"))
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        offset = self._start
+        return (
+            self._timestamps[offset + lo:offset + hi],
+            {name: values[offset + lo:offset + hi] for name, values in self._values.items()},
+        )
+
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + sum(values.nbytes for values in self._values.values())
+
+
+class Rollup:
+    """Averages samples into fixed-width buckets stored in their own ring buffer"""
+
+    def __init__(self, bucket_seconds: int, capacity: int, fields: Iterable[str]):
+        self.bucket_seconds = bucket_seconds
+        self.buffer = RingBuffer(capacity, fields)
+        self._bucket: Optional[float] = None
+        self._sums: Dict[str, float] = {}
+        self._count = 0
+
+    def add(self, timestamp: float, values: Dict[str, float]) -> None:
+        bucket = math.floor(timestamp / self.bucket_seconds) * self.bucket_seconds
+        if self._bucket is not None and bucket != self._bucket:
+            self.flush()
+        self._bucket = bucket
+        for name in self.buffer.fields:
+            self._sums[name] = self._sums.get(name, 0.0) + values.get(name, 0.0)
+        self._count += 1
+
+    def extend(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        """Vectorized add() of many samples (oldest first)"""
+        if len(timestamps) == 0:
+            return
+        buckets = np.floor(timestamps / self.bucket_seconds) * self.bucket_seconds
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(buckets)])
+        sums = {name: np.add.reduceat(values[name].astype(np.float64), starts) for name in self.buffer.fields}
+
+        if self._count and buckets[0] == self._bucket:
+            # The first bucket continues the open one
+            counts[0] += self._count
+            for name in self.buffer.fields:
+                sums[name][0] += self._sums.get(name, 0.0)
+        elif self._count:
+            self.flush()
+
+        # Every bucket but the last is complete
+        self.buffer.extend(buckets[starts[:-1]], {name: sums[name][:-1] / counts[:-1] for name in sums})
+        self._bucket = float(buckets[starts[-1]])
+        self._sums = {name: float(sums[name][-1]) for name in sums}
+        self._count = int(counts[-1])
+
+    def flush(self) -> None:
+        """Write the open bucket (timestamped at its start) to the buffer"""
+        if not self._count:
+            return
+        self.buffer.append(self._bucket, {name: total / self._count for name, total in self._sums.items()})
+        self._sums = {}
+        self._count = 0
+
+    def pending(self) -> Optional[Tuple[float, Dict[str, float]]]:
+        """The still-open bucket's running average, if any"""
+        if not self._count:
+            return None
+        return self._bucket, {name: total / self._count for name, total in self._sums.items()}
+
+
+class Series:
+    """One metric set at raw resolution plus 5-minute and hourly rollups"""
+
+    def __init__(self, fields: Iterable[str], raw_points: int, points_5m: int, points_1h: int):
+        self.fields = tuple(fields)
+        self.raw = RingBuffer(raw_points, self.fields)
+        self.rollups = {
+            "5m": Rollup(RESOLUTIONS["5m"], points_5m, self.fields),
+            "1h": Rollup(RESOLUTIONS["1h"], points_1h, self.fields),
+        }
+
+    def append(self, timestamp: float, values: Dict[str, float]) -> None:
+        self.raw.append(timestamp, values)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, values)
+
+    def extend(self, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        self.raw.extend(timestamps, values)
+        for rollup in self.rollups.values():
+            rollup.extend(timestamps, values)
+
+    def range(
+        self,
+        resolution: str = "raw",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Points of one resolution. Rollups include the open bucket's running
+        average as their newest point (which requires a copy).
+
+        Raises:
+            KeyError: For an unknown resolution
+        """
+        if resolution == "raw":
+            return self.raw.range(start, end, limit)
+
+        rollup = self.rollups[resolution]
+        timestamps, values = rollup.buffer.range(start, end, limit)
+        pending = rollup.pending()
+        if pending is None or (start is not None and pending[0] < start) or (end is not None and pending[0] > end):
+            return timestamps, values
+        if limit is not None and len(timestamps) >= limit:
+            timestamps = timestamps[1:]
+            values = {name: column[1:] for name, column in values.items()}
+        bucket, averages = pending
+        return (
+            np.append(timestamps, bucket),
+            {name: np.append(column, np.float32(averages[name])) for name, column in values.items()},
+        )
+
+    def nbytes(self) -> int:
+        return self.raw.nbytes() + sum(rollup.buffer.nbytes() for rollup in self.rollups.values())
+
+
+class HistoryStore:
+    """Dashboard totals plus one series per mailbox"""
+
+    def __init__(self):
+        self.totals = Series(TOTAL_FIELDS, HISTORY_RAW_POINTS, HISTORY_5M_POINTS, HISTORY_1H_POINTS)
+        self.mailboxes: Dict[str, Series] = {}
+
+    def record(self, timestamp: float, totals: Dict[str, float], mailboxes: Dict[str, Dict[str, float]]) -> None:
+        """Append one collection cycle"""
+        self.totals.append(timestamp, totals)
+        for name, values in mailboxes.items():
+            self._mailbox_series(name).append(timestamp, values)
+
+    def _mailbox_series(self, name: str) -> Series:
+        series = self.mailboxes.get(name)
+        if series is None:
+            series = self.mailboxes[name] = Series(
+                MAILBOX_FIELDS, HISTORY_MAILBOX_RAW_POINTS, HISTORY_MAILBOX_5M_POINTS, HISTORY_MAILBOX_1H_POINTS
+            )
+        return series
+
+    def load(
+        self,
+        totals: Tuple[np.ndarray, Dict[str, np.ndarray]],
+        mailboxes: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]],
+    ) -> None:
+        """Bulk-load column arrays (e.g. from the on-disk store at startup)"""
+        self.totals.extend(*totals)
+        for name, (timestamps, values) in mailboxes.items():
+            self._mailbox_series(name).extend(timestamps, values)
+
+    def oldest(self, resolution: str = "raw") -> Optional[float]:
+        """Oldest in-memory timestamp of the totals at a resolution"""
+        buffer = self.totals.raw if resolution == "raw" else self.totals.rollups[resolution].buffer
+        if len(buffer):
+            return float(buffer.timestamps[0])
+        pending = None if resolution == "raw" else self.totals.rollups[resolution].pending()
+        return pending[0] if pending else None
+
+    def mailbox_names(self) -> List[str]:
+        return sorted(self.mailboxes)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "raw_points": len(self.totals.raw),
+            "points_5m": len(self.totals.rollups["5m"].buffer),
+            "points_1h": len(self.totals.rollups["1h"].buffer),
+            "mailbox_series": len(self.mailboxes),
+            "memory_bytes": self.totals.nbytes() + sum(series.nbytes() for series in self.mailboxes.values()),
+        }
+
+
+def to_records(timestamps: np.ndarray, values: Dict[str, np.ndarray], integer_fields: Iterable[str] = ()) -> List[dict]:
+    """Column arrays -> list of JSON-ready dicts with ISO timestamps"""
+    iso = np.datetime_as_string((timestamps * 1000).astype("datetime64[ms]"), unit="ms")
+    columns = {name: column.astype(np.float64).round(2).tolist() for name, column in values.items()}
+    for name in integer_fields:
+        columns[name] = values[name].astype(np.int64).tolist()
+    names = list(columns)
+    return [
+        dict(zip(["timestamp", *names], row))
+        for row in zip(iso.tolist(), *(columns[name] for name in names))
+    ]
@@ -0,0 +1,201 @@
+"""
+Persistent Monitoring History
+Append-only SQLite store behind the in-memory history, so trend charts
+survive container restarts
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from history import MAILBOX_FIELDS, TOTAL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Empty disables persistence (history is then in-memory only)
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "/data/history.db")
+# Hours of history loaded back into memory on startup
+HISTORY_WARM_HOURS = float(os.getenv("HISTORY_WARM_HOURS", "24"))
+# Samples older than this are deleted from disk
+HISTORY_RETENTION_DAYS = float(os.getenv("HISTORY_RETENTION_DAYS", "365"))
+
+Columns = Tuple[np.ndarray, Dict[str, np.ndarray]]
+
+# Clustered on the time index (WITHOUT ROWID), so a range scan reads only the
+# rows of that range, in order
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS totals (
+    ts REAL PRIMARY KEY,
+    total_used_mb REAL NOT NULL,
+    average_usage_percent REAL NOT NULL,
+    mailbox_count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mailbox_samples (
+    mailbox TEXT NOT NULL,
+    ts REAL NOT NULL,
+    used_mb REAL NOT NULL,
+    usage_percent REAL NOT NULL,
+    PRIMARY KEY (mailbox, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_mailbox_samples_ts ON mailbox_samples (ts);
+"""
+
+
+def _columns(rows: List[tuple], fields: Tuple[str, ...]) -> Columns:
+    """Query rows (ts, *fields) -> column arrays"""
+    if not rows:
+        return np.empty(0, dtype=np.float64), {name: np.empty(0, dtype=np.float64) for name in fields}
+    table = np.array(rows, dtype=np.float64)
+    return table[:, 0], {name: table[:, i + 1] for i, name in enumerate(fields)}
+
+
+class HistoryDatabase:
+    """
+    One SQLite file in WAL mode. Calls are blocking and meant to run via
+    asyncio.to_thread; a lock serializes them on the shared connection.
+    """
+
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.last_load_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database is configured and open"""
+        return self._conn is not None
+
+    def open(self):
+        if not self.path or self._conn is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+        logger.info(f"History database opened at {self.path}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def append(self, timestamp: float, totals: Dict[str, float], mailboxes: Dict[str, Dict[str, float]]):
+        """Persist one collection cycle (one transaction)"""
+        if self._conn is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO totals VALUES (?, ?, ?, ?)",
+                (timestamp, *(totals[name] for name in TOTAL_FIELDS)),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO mailbox_samples VALUES (?, ?, ?, ?)",
+                [(name, timestamp, *(values[field] for field in MAILBOX_FIELDS)) for name, values in mailboxes.items()],
+            )
+            self.writes += 1
+
+    def prune(self, retention_days: float = HISTORY_RETENTION_DAYS) -> int:
+        """Delete samples past retention; returns the number of total rows removed"""
+        if self._conn is None:
+            return 0
+        cutoff = time.time() - retention_days * 86400
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM totals WHERE ts < ?", (cutoff,)).rowcount
+            self._conn.execute("DELETE FROM mailbox_samples WHERE ts < ?", (cutoff,))
+        return removed
+
+    def _select(
+        self,
+        table: str,
+        fields: Tuple[str, ...],
+        start: Optional[float],
+        end: Optional[float],
+        step: Optional[int],
+        limit: Optional[int],
+        mailbox: Optional[str] = None,
+    ) -> Columns:
+        where, params = ["ts >= ?", "ts <= ?"], [start if start is not None else 0.0, end if end is not None else time.time()]
+        if mailbox is not None:
+            where.insert(0, "mailbox = ?")
+            params.insert(0, mailbox)
+        if step:
+            # Bucket averages, timestamped at the bucket start
+            select = ", ".join(f"AVG({name})" for name in fields)
+            sql = (
+                f"SELECT CAST(ts / {int(step)} AS INTEGER) * {int(step)} AS bucket, {select} FROM {table} "
+                f"WHERE {' AND '.join(where)} GROUP BY bucket ORDER BY bucket DESC"
+            )
+        else:
+            sql = f"SELECT ts, {', '.join(fields)} FROM {table} WHERE {' AND '.join(where)} ORDER BY ts DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        rows.reverse()  # newest `limit` rows, returned oldest first
+        return _columns(rows, fields)
+
+    def totals(
+        self, start: Optional[float] = None, end: Optional[float] = None, step: Optional[int] = None, limit: Optional[int] = None
+    ) -> Columns:
+        """Dashboard totals in [start, end], raw or averaged per `step` seconds"""
+        return self._select("totals", TOTAL_FIELDS, start, end, step, limit)
+
+    def mailbox(
+        self,
+        name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        step: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Columns:
+        """One mailbox's samples in [start, end], raw or averaged per `step` seconds"""
+        return self._select("mailbox_samples", MAILBOX_FIELDS, start, end, step, limit, mailbox=name)
+
+    def load_recent(self, hours: float = HISTORY_WARM_HOURS) -> Tuple[Columns, Dict[str, Columns]]:
+        """Raw totals and per-mailbox samples of the last `hours`, for HistoryStore.load"""
+        if self._conn is None:
+            return _columns([], TOTAL_FIELDS), {}
+        started = time.perf_counter()
+        since = time.time() - hours * 3600
+        totals = self.totals(start=since)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT mailbox, ts, {', '.join(MAILBOX_FIELDS)} FROM mailbox_samples "
+                "WHERE ts >= ? ORDER BY mailbox, ts",
+                (since,),
+            ).fetchall()
+        mailboxes: Dict[str, Columns] = {}
+        if rows:
+            names = np.array([row[0] for row in rows])
+            table = np.array([row[1:] for row in rows], dtype=np.float64)
+            bounds = np.r_[np.flatnonzero(np.r_[True, names[1:] != names[:-1]]), len(names)]
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                mailboxes[str(names[lo])] = (
+                    table[lo:hi, 0],
+                    {name: table[lo:hi, i + 1] for i, name in enumerate(MAILBOX_FIELDS)},
+                )
+        self.last_load_ms = round((time.perf_counter() - started) * 1000, 1)
+        return totals, mailboxes
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self._conn is not None,
+            "path": self.path,
+            "writes": self.writes,
+            "last_load_ms": self.last_load_ms,
+        }
+
+
+history_db = HistoryDatabase()
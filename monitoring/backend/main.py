@@ -3,7 +3,8 @@ Monitoring Dashboard Backend API
 Provides real-time Mailcow monitoring data and statistics
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -11,9 +12,15 @@ import os
 import json
 import asyncio
 import time
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 import httpx
+import numpy as np
 from enum import Enum
+from downsample import METHODS, downsample
+from history import RESOLUTIONS, TOTAL_FIELDS, MAILBOX_FIELDS, HistoryStore, to_records
+from history_db import history_db
+from push import RESYNC, hub
 import logging
 import traceback
 
@@ -87,23 +94,82 @@ MAILCOW_API_KEY = os.getenv("MAILCOW_API_KEY", "")
 MAILCOW_VERIFY_SSL = os.getenv("MAILCOW_VERIFY_SSL", "false").lower() == "true"
 DEMO_MODE = os.getenv("DEMO_MODE", "true").lower() == "true"  # Enable demo mode by default
 
-# In-memory storage for historical data
-historical_data: List[Dict[str, Any]] = []
-last_update = None
-current_stats = None
+# Shared HTTP client (created on startup, reused by every Mailcow request)
+MAILCOW_POOL_MAX_CONNECTIONS = int(os.getenv("MAILCOW_POOL_MAX_CONNECTIONS", "10"))
+MAILCOW_POOL_MAX_KEEPALIVE = int(os.getenv("MAILCOW_POOL_MAX_KEEPALIVE", "5"))
+MAILCOW_POOL_KEEPALIVE_EXPIRY = float(os.getenv("MAILCOW_POOL_KEEPALIVE_EXPIRY", "60"))
+MAILCOW_CONNECT_TIMEOUT = float(os.getenv("MAILCOW_CONNECT_TIMEOUT", "5"))
+MAILCOW_DEFAULT_TIMEOUT = float(os.getenv("MAILCOW_DEFAULT_TIMEOUT", "10"))
+# HTTP/2 is only negotiated when the optional h2 package is installed
+MAILCOW_HTTP2 = os.getenv("MAILCOW_HTTP2", "true").lower() == "true"
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Per-endpoint read timeouts in seconds: the health probe should fail fast,
+# the full mailbox listing may take a while on large domains
+ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "/status": float(os.getenv("MAILCOW_STATUS_TIMEOUT", "5")),
+    "/mailbox": float(os.getenv("MAILCOW_MAILBOX_TIMEOUT", "20")),
+    "/forwarding/all": float(os.getenv("MAILCOW_FORWARDING_TIMEOUT", "10")),
+}
+
+# Background collection interval; endpoints serve the latest collected snapshot
+COLLECT_INTERVAL_SECONDS = float(os.getenv("UPDATE_INTERVAL", "30"))
+# How long a request right after startup waits for the first snapshot
+FIRST_SNAPSHOT_WAIT_SECONDS = float(os.getenv("FIRST_SNAPSHOT_WAIT_SECONDS", "15"))
+# How often samples past HISTORY_RETENTION_DAYS are deleted from disk
+HISTORY_PRUNE_INTERVAL_SECONDS = 3600
+
+# In-memory history (ring buffers with 5-minute and hourly rollups)
+history = HistoryStore()
 
 # ======================== HELPER FUNCTIONS ========================
 
-async def make_api_request(endpoint: str, timeout: int = 10) -> tuple[Optional[Any], Optional[str]]:
-    """Make authenticated request to Mailcow API"""
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the app-lifetime Mailcow client, creating it on first use"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            base_url=MAILCOW_API_URL,
+            headers={"X-API-Key": MAILCOW_API_KEY},
+            verify=MAILCOW_VERIFY_SSL,
+            http2=MAILCOW_HTTP2 and HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(MAILCOW_DEFAULT_TIMEOUT, connect=MAILCOW_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=MAILCOW_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=MAILCOW_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=MAILCOW_POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return http_client
+
+
+async def close_http_client():
+    """Close pooled connections (application shutdown)"""
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+async def make_api_request(endpoint: str, timeout: Optional[float] = None) -> tuple[Optional[Any], Optional[str]]:
+    """Make authenticated request to Mailcow API over the shared client"""
+    if timeout is None:
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, MAILCOW_DEFAULT_TIMEOUT)
     try:
-        url = f"{MAILCOW_API_URL}{endpoint}"
-        headers = {"X-API-Key": MAILCOW_API_KEY}
-        
-        async with httpx.AsyncClient(verify=MAILCOW_VERIFY_SSL, timeout=timeout) as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json(), None
+        client = get_http_client()
+        response = await client.get(
+            endpoint.lstrip("/"),
+            timeout=httpx.Timeout(timeout, connect=MAILCOW_CONNECT_TIMEOUT),
+        )
+        response.raise_for_status()
+        return response.json(), None
     except httpx.RequestError as e:
         return None, f"Request error: {str(e)}"
     except httpx.HTTPStatusError as e:
@@ -163,15 +229,9 @@ def get_overall_status(mailboxes: List[QuotaData]) -> StatusEnum:
     else:
         return StatusEnum.HEALTHY
 
-# ======================== API ENDPOINTS ========================
+# ======================== COLLECTION ========================
 
-@app.get("/health")
-async def health_check():
-    """Simple health check"""
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
-
-@app.get("/api/health", response_model=APIHealth)
-async def api_health():
+async def fetch_api_health() -> APIHealth:
     """Check Mailcow API health"""
     start_time = time.time()
     
@@ -193,87 +253,75 @@ async def api_health():
         error_message=None
     )
 
-@app.get("/api/mailboxes", response_model=MailboxSummary)
-async def get_mailboxes():
-    """Get all mailboxes and their quota"""
-    try:
-        # Use demo data if API key not configured
-        if not MAILCOW_API_KEY or MAILCOW_API_KEY == "your_api_key_here" or DEMO_MODE:
-            logger.info("Using demo mailbox data (DEMO_MODE=%s, API_KEY=%s)", DEMO_MODE, bool(MAILCOW_API_KEY))
-            data = get_demo_mailboxes()
-        else:
-            data, error = await make_api_request("/mailbox")
-            if error:
-                logger.warning(f"API error, falling back to demo: {error}")
-                data = get_demo_mailboxes()
-        
-        if not data:
-            logger.warning("No mailbox data, using demo")
+async def fetch_mailbox_summary() -> MailboxSummary:
+    """Fetch all mailboxes and summarize their quota"""
+    # Use demo data if API key not configured
+    if not MAILCOW_API_KEY or MAILCOW_API_KEY == "your_api_key_here" or DEMO_MODE:
+        logger.info("Using demo mailbox data (DEMO_MODE=%s, API_KEY=%s)", DEMO_MODE, bool(MAILCOW_API_KEY))
+        data = get_demo_mailboxes()
+    else:
+        data, error = await make_api_request("/mailbox")
+        if error:
+            logger.warning(f"API error, falling back to demo: {error}")
             data = get_demo_mailboxes()
-        
-        mailboxes = []
-        total_quota = 0.0
-        total_used = 0.0
-        
-        # Parse mailbox data
-        if isinstance(data, list):
-            for mailbox in data:
-                try:
-                    if mailbox.get("active") == 1:  # Only active mailboxes
-                        used_mb = float(mailbox.get("bytes", 0)) / (1024 * 1024)
-                        total_mb = float(mailbox.get("quota", 0)) / (1024 * 1024)
-                        
-                        if total_mb > 0:
-                            usage_percent = (used_mb / total_mb) * 100
-                        else:
-                            usage_percent = 0
-                        
-                        status = calculate_quota_status(usage_percent)
-                        
-                        mailboxes.append(QuotaData(
-                            mailbox=mailbox.get("username", "unknown"),
-                            used_mb=round(used_mb, 2),
-                            total_mb=round(total_mb, 2),
-                            usage_percent=round(usage_percent, 1),
-                            status=status
-                        ))
-                        
-                        total_quota += total_mb
-                        total_used += used_mb
-                except Exception as e:
-                    logger.error(f"Error processing mailbox {mailbox}: {e}")
-                    continue
-        
-        # Calculate averages
-        avg_usage = 0
-        if mailboxes and total_quota > 0:
-            avg_usage = (total_used / total_quota) * 100
-        
-        overall_status = get_overall_status(mailboxes)
-        
-        summary = MailboxSummary(
-            total_mailboxes=len(mailboxes),
-            total_quota_mb=round(total_quota, 2),
-            total_used_mb=round(total_used, 2),
-            average_usage_percent=round(avg_usage, 1),
-            status=overall_status,
-            mailboxes=sorted(mailboxes, key=lambda x: x.usage_percent, reverse=True)
-        )
-        
-        # Store historical data
-        store_historical_data(summary)
-        logger.info(f"Mailbox summary: {len(mailboxes)} mailboxes, {avg_usage:.1f}% avg usage")
-        
-        return summary
-        
-    except Exception as e:
-        logger.error(f"FATAL Error fetching mailboxes: {type(e).__name__}: {str(e)}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+    
+    if not data:
+        logger.warning("No mailbox data, using demo")
+        data = get_demo_mailboxes()
+    
+    mailboxes = []
+    total_quota = 0.0
+    total_used = 0.0
+    
+    # Parse mailbox data
+    if isinstance(data, list):
+        for mailbox in data:
+            try:
+                if mailbox.get("active") == 1:  # Only active mailboxes
+                    used_mb = float(mailbox.get("bytes", 0)) / (1024 * 1024)
+                    total_mb = float(mailbox.get("quota", 0)) / (1024 * 1024)
+                    
+                    if total_mb > 0:
+                        usage_percent = (used_mb / total_mb) * 100
+                    else:
+                        usage_percent = 0
+                    
+                    status = calculate_quota_status(usage_percent)
+                    
+                    mailboxes.append(QuotaData(
+                        mailbox=mailbox.get("username", "unknown"),
+                        used_mb=round(used_mb, 2),
+                        total_mb=round(total_mb, 2),
+                        usage_percent=round(usage_percent, 1),
+                        status=status
+                    ))
+                    
+                    total_quota += total_mb
+                    total_used += used_mb
+            except Exception as e:
+                logger.error(f"Error processing mailbox {mailbox}: {e}")
+                continue
+    
+    # Calculate averages
+    avg_usage = 0
+    if mailboxes and total_quota > 0:
+        avg_usage = (total_used / total_quota) * 100
+    
+    overall_status = get_overall_status(mailboxes)
+    
+    summary = MailboxSummary(
+        total_mailboxes=len(mailboxes),
+        total_quota_mb=round(total_quota, 2),
+        total_used_mb=round(total_used, 2),
+        average_usage_percent=round(avg_usage, 1),
+        status=overall_status,
+        mailboxes=sorted(mailboxes, key=lambda x: x.usage_percent, reverse=True)
+    )
+    logger.info(f"Mailbox summary: {len(mailboxes)} mailboxes, {avg_usage:.1f}% avg usage")
+    return summary
 
-@app.get("/api/forwarding", response_model=List[ForwardingRule])
-async def get_forwarding_rules():
-    """Get all forwarding rules"""
+async def fetch_forwarding_rules() -> List[ForwardingRule]:
+    """Fetch all forwarding rules (empty list on errors)"""
     try:
         data, error = await make_api_request("/forwarding/all")
         
@@ -301,82 +349,475 @@ async def get_forwarding_rules():
         logger.error(f"Error fetching forwarding rules: {str(e)}")
         return []
 
-@app.get("/api/stats", response_model=SystemStats)
-async def get_system_stats():
-    """Get complete system statistics"""
-    global current_stats
-    
-    logger.info("=== START get_system_stats ===")
+async def store_historical_data(summary: MailboxSummary) -> Dict[str, Any]:
+    """Store historical data for trending (in memory and on disk); returns the new point"""
+    timestamp = time.time()
+    totals = {
+        "total_used_mb": summary.total_used_mb,
+        "average_usage_percent": summary.average_usage_percent,
+        "mailbox_count": summary.total_mailboxes
+    }
+    mailboxes = {
+        mailbox.mailbox: {"used_mb": mailbox.used_mb, "usage_percent": mailbox.usage_percent}
+        for mailbox in summary.mailboxes
+    }
+    history.record(timestamp, totals, mailboxes)
     try:
-        logger.info("Step 1: Getting API health...")
-        health_data = await api_health()
-        logger.info(f"  ✓ API health: {health_data.status}")
-        
-        logger.info("Step 2: Getting mailbox summary...")
-        mailbox_summary = await get_mailboxes()
-        logger.info(f"  ✓ Mailboxes: {mailbox_summary.total_mailboxes}")
-        
-        logger.info("Step 3: Getting forwarding rules...")
-        forwarding = await get_forwarding_rules()
-        logger.info(f"  ✓ Forwarding rules: {len(forwarding)}")
-        
-        logger.info("Step 4: Creating stats object...")
+        await asyncio.to_thread(history_db.append, timestamp, totals, mailboxes)
+    except Exception as e:
+        logger.error(f"Could not persist history point: {str(e)}")
+    return {"timestamp": datetime.utcfromtimestamp(timestamp).isoformat(), **totals}
+
+async def load_history():
+    """Open the history database and warm the in-memory history from it"""
+    try:
+        await asyncio.to_thread(history_db.open)
+        totals, mailboxes = await asyncio.to_thread(history_db.load_recent)
+        history.load(totals, mailboxes)
+        logger.info(f"Loaded {len(totals[0])} history points from disk in {history_db.last_load_ms} ms")
+    except Exception as e:
+        logger.error(f"History database unavailable, keeping history in memory only: {str(e)}")
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One collection cycle, with every endpoint's response pre-serialized"""
+    stats: SystemStats
+    collected_at: float
+    stats_json: bytes
+    mailboxes_json: bytes
+    forwarding_json: bytes
+    status_json: bytes
+
+    @classmethod
+    def build(cls, stats: SystemStats) -> "Snapshot":
+        summary = stats.mailbox_summary
+        status = {
+            "overall_status": summary.status,
+            "total_mailboxes": summary.total_mailboxes,
+            "average_usage": summary.average_usage_percent,
+            "api_health": stats.api_health.status,
+            "timestamp": stats.collection_timestamp
+        }
+        return cls(
+            stats=stats,
+            collected_at=time.time(),
+            stats_json=stats.model_dump_json().encode(),
+            mailboxes_json=summary.model_dump_json().encode(),
+            forwarding_json=json.dumps([rule.model_dump() for rule in stats.forwarding_rules]).encode(),
+            status_json=json.dumps(status).encode(),
+        )
+
+    def resync_message(self, seq: int) -> str:
+        """Full state for a (re)connecting push client"""
+        return f'{{"type": "resync", "seq": {seq}, "stats": {self.stats_json.decode()}}}'
+
+def status_transitions(previous: SystemStats, current: SystemStats) -> List[Dict[str, Any]]:
+    """Overall, API health and per-mailbox status changes between two cycles"""
+    transitions = []
+    pairs = [
+        ("overall", previous.mailbox_summary.status, current.mailbox_summary.status),
+        ("api_health", previous.api_health.status, current.api_health.status),
+    ]
+    previous_mailboxes = {m.mailbox: m.status for m in previous.mailbox_summary.mailboxes}
+    pairs += [
+        (m.mailbox, previous_mailboxes[m.mailbox], m.status)
+        for m in current.mailbox_summary.mailboxes
+        if m.mailbox in previous_mailboxes
+    ]
+    for target, old, new in pairs:
+        if old != new:
+            transitions.append({"target": target, "from": old.value, "to": new.value})
+    return transitions
+
+def build_delta(previous: Snapshot, current: Snapshot, history_point: Dict[str, Any], seq: int) -> str:
+    """Serialized changes between two snapshots, for the push channel"""
+    stats, old_stats = current.stats, previous.stats
+    summary, old_summary = stats.mailbox_summary, old_stats.mailbox_summary
+    delta: Dict[str, Any] = {
+        "type": "delta",
+        "seq": seq,
+        "timestamp": stats.collection_timestamp,
+        "api_health": stats.api_health.model_dump(mode="json"),
+        "history_point": history_point,
+    }
+
+    summary_fields = summary.model_dump(mode="json", exclude={"mailboxes"})
+    if summary_fields != old_summary.model_dump(mode="json", exclude={"mailboxes"}):
+        delta["summary"] = summary_fields
+
+    old_mailboxes = {m.mailbox: m for m in old_summary.mailboxes}
+    changed = [m.model_dump(mode="json") for m in summary.mailboxes if old_mailboxes.get(m.mailbox) != m]
+    removed = sorted(set(old_mailboxes) - {m.mailbox for m in summary.mailboxes})
+    if changed or removed:
+        delta["mailboxes"] = {"changed": changed, "removed": removed}
+
+    if stats.forwarding_rules != old_stats.forwarding_rules:
+        delta["forwarding_rules"] = [rule.model_dump(mode="json") for rule in stats.forwarding_rules]
+
+    transitions = status_transitions(old_stats, stats)
+    if transitions:
+        delta["status_transitions"] = transitions
+    return json.dumps(delta)
+
+class StatsCollector:
+    """
+    Single background loop that polls Mailcow every COLLECT_INTERVAL_SECONDS
+    and publishes an immutable Snapshot. Endpoints only read the current
+    snapshot, so upstream load does not grow with the number of dashboards.
+    """
+
+    def __init__(self, interval: float = COLLECT_INTERVAL_SECONDS):
+        self.interval = interval
+        self.snapshot: Optional[Snapshot] = None
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_duration_ms = 0.0
+        self._last_prune = 0.0
+
+    async def collect_once(self) -> Snapshot:
+        """Run one collection cycle and publish its snapshot"""
+        started = time.perf_counter()
+        # Health, mailboxes and forwarding are independent: fetch them concurrently
+        health_data, mailbox_summary, forwarding = await asyncio.gather(
+            fetch_api_health(),
+            fetch_mailbox_summary(),
+            fetch_forwarding_rules(),
+        )
         stats = SystemStats(
             api_health=health_data,
             mailbox_summary=mailbox_summary,
             forwarding_rules=forwarding,
             collection_timestamp=datetime.utcnow().isoformat(),
-            update_interval_seconds=30
+            update_interval_seconds=int(self.interval)
         )
-        
-        current_stats = stats
-        logger.info("=== COMPLETE get_system_stats ===")
-        return stats
-        
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        logger.error(f"FATAL Error in get_system_stats: {error_msg}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=error_msg)
-
-def store_historical_data(summary: MailboxSummary):
-    """Store historical data for trending"""
-    global historical_data
-    
-    data_point = {
+        history_point = await store_historical_data(mailbox_summary)
+
+        previous = self.snapshot
+        snapshot = Snapshot.build(stats)
+        self.snapshot = snapshot  # single reference swap; readers never see a partial update
+        self._ready.set()
+        if len(hub):
+            seq = hub.next_seq()
+            hub.publish(
+                build_delta(previous, snapshot, history_point, seq) if previous else snapshot.resync_message(seq)
+            )
+        self.cycles += 1
+        self.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        return snapshot
+
+    async def _run(self):
+        while True:
+            try:
+                await self.collect_once()
+                if time.time() - self._last_prune > HISTORY_PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = time.time()
+                    await asyncio.to_thread(history_db.prune)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {str(e)}"
+                logger.error(f"Collection cycle failed: {self.last_error}")
+                logger.error(traceback.format_exc())
+            await asyncio.sleep(self.interval)
+
+    async def current(self) -> Snapshot:
+        """
+        Latest snapshot, waiting for the first collection after startup.
+
+        Raises:
+            HTTPException: 503 if no snapshot is available yet
+        """
+        if self.snapshot is None:
+            try:
+                await asyncio.wait_for(self._ready.wait(), FIRST_SNAPSHOT_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        if self.snapshot is None:
+            raise HTTPException(status_code=503, detail="No data available yet")
+        return self.snapshot
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "cycles": self.cycles,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_duration_ms": self.last_duration_ms,
+            "snapshot_age_seconds": round(time.time() - self.snapshot.collected_at, 1) if self.snapshot else None,
+        }
+
+collector = StatsCollector()
+
+def snapshot_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+# ======================== LIFECYCLE ========================
+
+@app.on_event("startup")
+async def on_startup():
+    get_http_client()
+    await load_history()
+    collector.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await collector.stop()
+    await close_http_client()
+    history_db.close()
+
+# ======================== API ENDPOINTS ========================
+
+@app.get("/health")
+async def health_check():
+    """Simple health check"""
+    return {
+        "status": "ok",
         "timestamp": datetime.utcnow().isoformat(),
-        "total_used_mb": summary.total_used_mb,
-        "average_usage_percent": summary.average_usage_percent,
-        "mailbox_count": summary.total_mailboxes
+        "collector": collector.stats(),
+        "history": history.stats(),
+        "history_db": history_db.stats(),
+        "push": hub.stats()
     }
-    
-    historical_data.append(data_point)
-    
-    # Keep only last 24 hours of data (one point per 30 seconds = 2880 points)
-    if len(historical_data) > 2880:
-        historical_data = historical_data[-2880:]
+
+@app.get("/api/health", response_model=APIHealth)
+async def api_health():
+    """Check Mailcow API health (live probe)"""
+    return await fetch_api_health()
+
+@app.get("/api/mailboxes", response_model=MailboxSummary)
+async def get_mailboxes():
+    """Get all mailboxes and their quota (latest snapshot)"""
+    snapshot = await collector.current()
+    return snapshot_response(snapshot.mailboxes_json)
+
+@app.get("/api/forwarding", response_model=List[ForwardingRule])
+async def get_forwarding_rules():
+    """Get all forwarding rules (latest snapshot)"""
+    snapshot = await collector.current()
+    return snapshot_response(snapshot.forwarding_json)
+
+@app.get("/api/stats", response_model=SystemStats)
+async def get_system_stats():
+    """Get complete system statistics (latest snapshot)"""
+    snapshot = await collector.current()
+    return snapshot_response(snapshot.stats_json)
+
+def check_resolution(resolution: str):
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(RESOLUTIONS)}")
+
+def epoch(value: Optional[datetime]) -> Optional[float]:
+    """Naive datetimes are UTC, like the timestamps the API returns"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def use_database(resolution: str, start: Optional[float], step: Optional[int], oldest: Optional[float]) -> bool:
+    """Serve from disk when a step is requested or the range predates what is in memory"""
+    if not history_db.enabled:
+        return False
+    return step is not None or (start is not None and (oldest is None or start < oldest))
 
 @app.get("/api/history", response_model=List[HistoricalData])
-async def get_history(limit: int = 100):
-    """Get historical data for trending"""
-    recent = historical_data[-limit:] if historical_data else []
-    return [HistoricalData(**d) for d in recent]
+async def get_history(
+    limit: int = Query(100, ge=1),
+    resolution: str = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    step: Optional[int] = Query(None, ge=1, description="Average into buckets of this many seconds"),
+):
+    """
+    Get historical data for trending (raw samples or 5m / 1h averages).
+
+    Recent ranges come from memory; older ranges and `step` queries read
+    only the requested slice from the on-disk store.
+    """
+    check_resolution(resolution)
+    start_ts, end_ts = epoch(start), epoch(end)
+    if use_database(resolution, start_ts, step, history.oldest(resolution)):
+        timestamps, values = await asyncio.to_thread(
+            history_db.totals, start_ts, end_ts, step or RESOLUTIONS[resolution] or None, limit
+        )
+    else:
+        timestamps, values = history.totals.range(resolution, start_ts, end_ts, limit)
+    return JSONResponse(to_records(timestamps, values, integer_fields=("mailbox_count",)))
+
+@app.get("/api/history/mailboxes")
+async def get_history_mailboxes():
+    """Mailboxes that have a history series"""
+    return history.mailbox_names()
+
+@app.get("/api/history/mailboxes/{mailbox}")
+async def get_mailbox_history(
+    mailbox: str,
+    limit: int = Query(100, ge=1),
+    resolution: str = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    step: Optional[int] = Query(None, ge=1, description="Average into buckets of this many seconds"),
+):
+    """Usage history of a single mailbox"""
+    check_resolution(resolution)
+    series = history.mailboxes.get(mailbox)
+    if series is None and not history_db.enabled:
+        raise HTTPException(status_code=404, detail="Unknown mailbox")
+
+    start_ts, end_ts = epoch(start), epoch(end)
+    oldest = float(series.raw.timestamps[0]) if series is not None and len(series.raw) else None
+    if series is None or use_database(resolution, start_ts, step, oldest):
+        timestamps, values = await asyncio.to_thread(
+            history_db.mailbox, mailbox, start_ts, end_ts, step or RESOLUTIONS[resolution] or None, limit
+        )
+    else:
+        timestamps, values = series.range(resolution, start_ts, end_ts, limit)
+    return JSONResponse(to_records(timestamps, values))
+
+async def load_series(
+    mailbox: Optional[str], start: float, end: float, points: int
+) -> tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Samples of [start, end] from the cheapest source that still has enough
+    detail for `points` output points: in-memory raw, the on-disk store
+    (pre-aggregated in SQL for long ranges) or, without a database, the
+    finest in-memory resolution that covers `points` samples of the range.
+    """
+    series = history.totals if mailbox is None else history.mailboxes.get(mailbox)
+    oldest = float(series.raw.timestamps[0]) if series is not None and len(series.raw) else None
+    if series is not None and oldest is not None and start >= oldest:
+        return series.range("raw", start, end)
+
+    if history_db.enabled:
+        # Aim for ~4 source samples per output point; short steps read raw rows
+        step = int((end - start) / (points * 4))
+        step = step if step >= 60 else None
+        if mailbox is None:
+            return await asyncio.to_thread(history_db.totals, start, end, step)
+        return await asyncio.to_thread(history_db.mailbox, mailbox, start, end, step)
+
+    if series is None:
+        raise HTTPException(status_code=404, detail="Unknown mailbox")
+    # Finest resolution with enough samples; if none has, the one with the most
+    best = None
+    for resolution in ("raw", "5m", "1h"):
+        timestamps, values = series.range(resolution, start, end)
+        if len(timestamps) >= points:
+            return timestamps, values
+        if best is None or len(timestamps) > len(best[0]):
+            best = (timestamps, values)
+    return best
+
+@app.get("/api/history/downsampled")
+async def get_downsampled_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(500, ge=3, le=5000),
+    method: str = "lttb",
+    field: Optional[str] = Query(None, description="Series that drives point selection"),
+    mailbox: Optional[str] = None,
+):
+    """
+    History of a time range reduced to at most `points` points (default: last 24h).
+
+    `lttb` keeps the visual shape, `minmax` keeps every bucket's extremes.
+    All fields are returned for the selected samples.
+    """
+    if method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(METHODS)}")
+    fields = TOTAL_FIELDS if mailbox is None else MAILBOX_FIELDS
+    field = field or ("average_usage_percent" if mailbox is None else "usage_percent")
+    if field not in fields:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(fields)}")
+
+    end_ts = epoch(end) or time.time()
+    start_ts = epoch(start) or end_ts - 86400
+    if start_ts >= end_ts:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    timestamps, values = await load_series(mailbox, start_ts, end_ts, points)
+    keep = downsample(timestamps, values[field].astype(np.float64), points, method)
+    records = to_records(
+        timestamps[keep],
+        {name: column[keep] for name, column in values.items()},
+        integer_fields=("mailbox_count",) if mailbox is None else (),
+    )
+    return JSONResponse({
+        "method": method,
+        "field": field,
+        "start": datetime.utcfromtimestamp(start_ts).isoformat(),
+        "end": datetime.utcfromtimestamp(end_ts).isoformat(),
+        "source_points": len(timestamps),
+        "points": records
+    })
+
+@app.websocket("/ws")
+async def updates_socket(websocket: WebSocket):
+    """
+    Push channel for dashboards: a `resync` message with the full stats on
+    connect, then one `delta` per collection cycle with only what changed
+    (mailboxes, summary, status transitions, the new history point).
+    Messages carry a sequence number; on a gap the client sends
+    {"type": "resync"} (or reconnects) to get the full state again.
+    """
+    await websocket.accept()
+    queue = hub.subscribe()
+    queue.put_nowait(RESYNC)
+
+    async def receive():
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    continue
+                if isinstance(message, dict) and message.get("type") == "resync" and not queue.full():
+                    queue.put_nowait(RESYNC)
+        except WebSocketDisconnect:
+            pass
+
+    async def send():
+        try:
+            while True:
+                message = await queue.get()
+                if message is RESYNC:
+                    snapshot = collector.snapshot
+                    if snapshot is None:
+                        continue  # the first cycle will be pushed as a resync
+                    message = snapshot.resync_message(hub.seq)
+                await websocket.send_text(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        hub.unsubscribe(queue)
 
 @app.get("/api/status")
 async def get_status():
     """Quick status endpoint"""
-    global current_stats
-    
-    if not current_stats:
-        raise HTTPException(status_code=503, detail="No data available yet")
-    
-    return {
-        "overall_status": current_stats.mailbox_summary.status,
-        "total_mailboxes": current_stats.mailbox_summary.total_mailboxes,
-        "average_usage": current_stats.mailbox_summary.average_usage_percent,
-        "api_health": current_stats.api_health.status,
-        "timestamp": current_stats.collection_timestamp
-    }
+    snapshot = await collector.current()
+    return snapshot_response(snapshot.status_json)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,73 @@
+"""
+Dashboard Push Channel
+Fan-out of per-cycle update messages to connected WebSocket clients
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per client before it is considered too slow and resynced
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "16"))
+
+# Queue marker: send the client a full resync instead of the next delta
+RESYNC = object()
+
+Message = Union[str, object]
+
+
+class UpdateHub:
+    """
+    Each subscriber gets a bounded queue. A message is serialized once by the
+    publisher and the same string is handed to every queue, so a cycle costs
+    the same regardless of how many dashboards are open. A client that falls
+    behind has its backlog replaced by a single RESYNC marker.
+    """
+
+    def __init__(self, queue_size: int = PUSH_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.seq = 0
+        self.published = 0
+        self.overflows = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def next_seq(self) -> int:
+        self.seq += 1
+        return self.seq
+
+    def publish(self, message: str) -> None:
+        """Queue a serialized message for every subscriber (never blocks)"""
+        self.published += 1
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.overflows += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "seq": self.seq,
+            "published": self.published,
+            "overflows": self.overflows,
+        }
+
+
+hub = UpdateHub()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Monitoring History Tests
+
+Checks the history sources behind the dashboard trend chart:
+- Downsampling never returns more points than requested
+- Without a database, the downsampled history uses the finest in-memory
+  resolution that has enough samples
+
+Run with pytest or directly: python test_history.py
+"""
+
+import asyncio
+import os
+
+os.environ["HISTORY_DB_PATH"] = ""
+
+import numpy as np
+
+import main
+from downsample import downsample
+from history import TOTAL_FIELDS, HistoryStore, Series
+
+
+def test_downsample_respects_points():
+    """Both methods return at most `points` indices, including both ends"""
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 50) + np.random.default_rng(0).normal(0, 0.1, len(x))
+    for method in ("lttb", "minmax"):
+        for points in (3, 4, 99, 100, 501):
+            keep = downsample(x, y, points, method)
+            assert len(keep) <= points, (method, points, len(keep))
+            assert keep[0] == 0 and keep[-1] == len(x) - 1
+
+
+def test_load_series_prefers_raw_without_database():
+    """A fresh store answers a 24h range from raw samples, not one hourly average"""
+    main.history = HistoryStore()
+    now = 1_700_000_000.0
+    for i in range(4):
+        main.history.record(
+            now - 90 + i * 30,
+            {"total_used_mb": 100.0 + i, "average_usage_percent": 10.0 + i, "mailbox_count": 3},
+            {},
+        )
+
+    timestamps, _ = asyncio.run(main.load_series(None, now - 86400, now, 500))
+    assert not main.history_db.enabled
+    assert len(timestamps) == 4
+
+
+def test_load_series_uses_rollup_when_raw_is_short():
+    """Once raw has wrapped, a rollup with enough samples of the range is used"""
+    main.history = HistoryStore()
+    main.history.totals = Series(TOTAL_FIELDS, 10, 8640, 8760)
+    now = 1_700_000_000.0
+    # Two days of 5-minute samples: raw keeps the last 10, the 5m rollup all of them
+    for i in range(576):
+        main.history.record(
+            now - 576 * 300 + i * 300,
+            {"total_used_mb": float(i), "average_usage_percent": 1.0, "mailbox_count": 1},
+            {},
+        )
+
+    timestamps, _ = asyncio.run(main.load_series(None, now - 2 * 86400, now, 40))
+    assert len(timestamps) >= 500
+    assert np.all(np.diff(timestamps) == 300)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")